@@ -1,12 +1,17 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status, Security
 from fastapi.security import APIKeyCookie, HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.core.database import get_db
+from app.core.database import ReplicaSession, get_read_db, replica_router
 from app.core.security import decode_access_token
 from app.models.user import User
+from app.schemas.user import Principal
+from app.services.principal_cache import principal_cache
+from app.services.token_revocation import token_revocations
+from app.core.config import get_settings
+
+_settings = get_settings()
 
 # 문서용 토큰 발급 경로는 v1 기준으로 맞춤
 # oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
@@ -15,8 +20,8 @@ refresh_cookie = APIKeyCookie(name="refresh_token", auto_error=False)
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials | None = Security(bearer_scheme),
-    db: AsyncSession = Depends(get_db),
-) -> User:
+    db: ReplicaSession = Depends(get_read_db),
+) -> Principal:
     cred_exc = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     if credentials is None or (credentials.scheme or "").lower() != "bearer":
@@ -28,20 +33,38 @@ async def get_current_user(
         payload = decode_access_token(token_str)
         if payload.get("typ") != "access":
             raise cred_exc
-        sub = payload.get("sub")
-        if not sub:
-            raise cred_exc
+        user_pk = int(payload.get("sub"))
     except Exception:
         raise cred_exc
 
-    res = await db.execute(select(User).where(User.id == sub))  # 필요시 int(sub)
-    user = res.scalar_one_or_none()
-    if not user or not user.is_active:
+    # stateless 모드: 토큰에 담긴 사용자 정보 + 인메모리 폐기 목록만 확인 (이전 형식 토큰은 아래 조회로 처리)
+    if _settings.AUTH_STATELESS_TOKENS and "uid" in payload:
+        if not payload.get("act") or token_revocations.is_revoked(payload):
+            raise cred_exc
+        return Principal(id=user_pk, user_id=payload["uid"], user_name=payload["name"], couple_id=payload.get("cid"), is_active=True)
+
+    # 캐시 hit이면 DB 조회 없이 반환 (항목은 token exp 이후로 남지 않음)
+    user = principal_cache.get(user_pk)
+    if user is None:
+        # 방금 바뀐 사용자는 primary에서 조회 (replica 반영 지연으로 이전 정보를 보지 않도록)
+        if replica_router.recently_written(user_pk):
+            await db.use_primary()
+        query = select(User.id, User.user_id, User.user_name, User.couple_id, User.is_active).where(User.id == user_pk)
+        row = (await db.execute(query)).mappings().one_or_none()
+        if not row and db.replica is not None:
+            # replica에 아직 없는 사용자일 수 있으므로 primary에서 한 번 더 확인
+            await db.use_primary()
+            row = (await db.execute(query)).mappings().one_or_none()
+        if not row:
+            raise cred_exc
+        user = Principal(**row)
+        principal_cache.put(user, payload.get("exp"))
+    if not user.is_active:
         raise cred_exc
     return user
 
 # (선택) 관리자 권한 가드 예시
-# async def require_admin(user: User = Depends(get_current_user)) -> User:
+# async def require_admin(user: Principal = Depends(get_current_user)) -> Principal:
 #     # roles가 있다면 검사하는 형태로 확장
 #     # if "admin" not in user.roles: raise HTTPException(403, "Forbidden")
 #     return user
@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import janus, users, auth
+from app.api.v1.endpoints import janus, users, auth, system
 
 # API v1 메인 라우터
 api_router = APIRouter()
@@ -7,4 +7,5 @@ api_router = APIRouter()
 # janus 엔드포인트 라우터를 포함
 api_router.include_router(janus.router, prefix="/janus", tags=["Janus VideoRoom"])
 api_router.include_router(users.router, prefix="/users", tags=["Users"])
-api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
\ No newline at end of file
+api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
+api_router.include_router(system.router, prefix="/system", tags=["System"])
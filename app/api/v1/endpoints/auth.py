@@ -2,9 +2,11 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, Cookie, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import get_current_user
 from app.core.database import get_db
 from app.core.config import get_settings
-from app.schemas.user import UserCreate
+from app.core.jwt_keys import get_signing_keys
+from app.schemas.user import Principal, UserCreate
 from app.schemas.auth import LoginIn, TokenOut
 from app.services.auth_service import (
     register_user,
@@ -12,6 +14,12 @@ from app.services.auth_service import (
     rotate_refresh,
     revoke_refresh,
 )
+from app.services.password_hasher import password_hasher
+from app.services.login_throttle import login_throttle
+from app.services.principal_cache import principal_cache
+from app.services.token_revocation import token_revocations
+from app.services.token_maintenance import refresh_token_purger
+from app.services.refresh_token_store import refresh_token_store
 
 router = APIRouter()
 _settings = get_settings()
@@ -27,6 +35,27 @@ def set_refresh_cookie(response: Response, value: str, max_age: int) -> None:
         path="/",
     )
 
+@router.get("/stats", summary="인증 관련 내부 상태 조회 (해시 작업자 풀, 캐시, 토큰 폐기/정리, 로그인 필요)")
+async def get_auth_stats(_user: Principal = Depends(get_current_user)):
+    return {
+        "password_hasher": password_hasher.stats(),
+        "login_throttle": login_throttle.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_revocations": token_revocations.stats(),
+        "refresh_token_purger": refresh_token_purger.stats(),
+        "refresh_token_store": refresh_token_store.stats(),
+    }
+
+@router.get("/jwks.json", summary="access token 검증용 공개키 (JWKS, RS256/ES256 사용 시)")
+async def get_jwks(request: Request):
+    keys = get_signing_keys()
+    if keys is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asymmetric signing is not enabled")
+    headers = {"Cache-Control": f"public, max-age={_settings.JWKS_CACHE_MAX_AGE}", "ETag": keys.jwks_etag}
+    if request.headers.get("if-none-match") == keys.jwks_etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=keys.jwks_body, media_type="application/json", headers=headers)
+
 @router.post("/register", status_code=201)
 async def register(body: UserCreate, db: AsyncSession = Depends(get_db)):
     try:
@@ -37,6 +66,8 @@ async def register(body: UserCreate, db: AsyncSession = Depends(get_db)):
 
 @router.post("/login", response_model=TokenOut)
 async def login(body: LoginIn, request: Request, response: Response, db: AsyncSession = Depends(get_db)):
+    # bcrypt 검증 전에 IP/계정별 시도 횟수 제한
+    await login_throttle.check(request.client.host if request.client else None, body.user_id)
     try:
         access, expires_in, refresh_plain, refresh_max_age = await login_issue_tokens(
             db=db,
@@ -1,15 +1,88 @@
 # app/api/v1/endpoints/janus.py
 
-from fastapi import APIRouter, Depends, status, Response
-from typing import List
+import json
+import asyncio
+import secrets
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status, Response
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from typing import Any, List
 
+from app.api.deps import get_current_user
+from app.core.config import get_settings
+from app.schemas.user import Principal
 from app.schemas.janus import (
     RoomCreateRequest, RoomDetailsResponse, RoomUpdateRequest,
-    ParticipantDetails, SuccessResponse, RoomDestroyRequest
+    ParticipantDetails, SuccessResponse, RoomDestroyRequest,
+    RoomBatchCreateRequest, RoomBatchDestroyRequest, RoomBatchParticipantsRequest,
+    RoomBatchCreateResponse, RoomBatchDestroyResponse, RoomBatchParticipantsResponse,
+    RoomBatchCreateResult, RoomBatchDestroyResult, RoomBatchParticipantsResult,
 )
 from app.services.janus_service import JanusService, janus_service
 
 router = APIRouter()
+_settings = get_settings()
+events_basic = HTTPBasic(auto_error=False)
+
+
+def _check_events_auth(credentials: HTTPBasicCredentials | None) -> None:
+    """event handler의 backend_user/backend_pwd 검사 (설정하지 않았으면 모든 요청 거부)"""
+    if not (_settings.JANUS_EVENTS_USER and _settings.JANUS_EVENTS_PASSWORD):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Janus event webhook credentials are not configured",
+        )
+    if credentials is None or not (
+        secrets.compare_digest(credentials.username, _settings.JANUS_EVENTS_USER)
+        and secrets.compare_digest(credentials.password, _settings.JANUS_EVENTS_PASSWORD)
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+
+def _check_batch_size(size: int) -> None:
+    if size > _settings.JANUS_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Too many items in batch (max {_settings.JANUS_BATCH_MAX_ITEMS})",
+        )
+
+
+def _item_status(index: int, result) -> dict:
+    """개별 결과를 BatchItemResult 필드로 변환"""
+    if isinstance(result, HTTPException):
+        return {"index": index, "ok": False, "status_code": result.status_code, "error": str(result.detail)}
+    if isinstance(result, Exception):
+        return {"index": index, "ok": False, "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR, "error": str(result)}
+    return {"index": index, "ok": True, "status_code": status.HTTP_200_OK}
+
+
+def _summary(results: list) -> dict:
+    succeeded = sum(1 for r in results if r.ok)
+    return {"total": len(results), "succeeded": succeeded, "failed": len(results) - succeeded, "results": results}
+
+# STATS
+@router.get("/stats", summary="Janus 연결 풀/서비스 상태 조회 (로그인 필요)")
+async def get_janus_stats(
+    service: JanusService = Depends(lambda: janus_service),
+    _user: Principal = Depends(get_current_user),
+):
+    return service.stats()
+
+# EVENTS (Janus event handler 웹훅)
+@router.post("/events", summary="Janus event handler 이벤트 수신")
+async def receive_janus_events(
+    events: Any = Body(...),
+    credentials: HTTPBasicCredentials | None = Depends(events_basic),
+    service: JanusService = Depends(lambda: janus_service)
+):
+    _check_events_auth(credentials)
+    # sampleevh는 grouping 설정에 따라 이벤트 하나 또는 배열을 보냄
+    if isinstance(events, dict):
+        events = [events]
+    if not isinstance(events, list):
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Expected an event object or array")
+    applied = sum(1 for event in events if isinstance(event, dict) and service.handle_event(event))
+    return {"received": len(events), "applied": applied}
 
 # CREATE
 @router.post(
@@ -27,6 +100,76 @@ async def create_janus_room(
     )
     return RoomDetailsResponse(**room_data)
 
+# BATCH CREATE
+@router.post(
+    "/rooms/batch",
+    response_model=RoomBatchCreateResponse,
+    summary="비디오룸 일괄 생성"
+)
+async def batch_create_rooms(
+    request: RoomBatchCreateRequest,
+    service: JanusService = Depends(lambda: janus_service)
+):
+    _check_batch_size(len(request.rooms))
+    results = await service.run_batch([
+        lambda room=room: service.create_videoroom(description=room.room_description, secret=room.secret)
+        for room in request.rooms
+    ])
+    items = []
+    for i, result in enumerate(results):
+        item = RoomBatchCreateResult(**_item_status(i, result))
+        if item.ok:
+            item.status_code = status.HTTP_201_CREATED
+            item.room = RoomDetailsResponse(**result)
+        items.append(item)
+    return RoomBatchCreateResponse(**_summary(items))
+
+# BATCH DELETE
+@router.post(
+    "/rooms/batch/destroy",
+    response_model=RoomBatchDestroyResponse,
+    summary="비디오룸 일괄 삭제"
+)
+async def batch_destroy_rooms(
+    request: RoomBatchDestroyRequest,
+    service: JanusService = Depends(lambda: janus_service)
+):
+    _check_batch_size(len(request.rooms))
+    results = await service.run_batch([
+        lambda room=room: service.destroy_videoroom(room_id=room.room_id, secret=room.secret)
+        for room in request.rooms
+    ])
+    items = []
+    for i, (room, result) in enumerate(zip(request.rooms, results)):
+        item = RoomBatchDestroyResult(room_id=room.room_id, **_item_status(i, result))
+        if item.ok:
+            item.status_code = status.HTTP_204_NO_CONTENT
+        items.append(item)
+    return RoomBatchDestroyResponse(**_summary(items))
+
+# BATCH READ (Participants)
+@router.post(
+    "/rooms/batch/participants",
+    response_model=RoomBatchParticipantsResponse,
+    summary="여러 방의 참여자 목록 일괄 조회"
+)
+async def batch_room_participants(
+    request: RoomBatchParticipantsRequest,
+    service: JanusService = Depends(lambda: janus_service)
+):
+    _check_batch_size(len(request.room_ids))
+    results = await service.run_batch([
+        lambda room_id=room_id: service.get_room_participants(room_id=room_id)
+        for room_id in request.room_ids
+    ])
+    items = []
+    for i, (room_id, result) in enumerate(zip(request.room_ids, results)):
+        item = RoomBatchParticipantsResult(room_id=room_id, **_item_status(i, result))
+        if item.ok:
+            item.participants = [ParticipantDetails(**p) for p in result]
+        items.append(item)
+    return RoomBatchParticipantsResponse(**_summary(items))
+
 # READ (List)
 @router.get(
     "/rooms",
@@ -47,6 +190,38 @@ async def get_room_participants(
 ):
     return await service.get_room_participants(room_id=room_id)
 
+# STREAM (Participants, SSE)
+@router.get(
+    "/rooms/{room_id}/participants/stream",
+    summary="특정 방의 참여자 변화 스트림 (SSE)",
+    response_class=StreamingResponse,
+)
+async def stream_room_participants(
+    room_id: int,
+    request: Request,
+    user=Depends(get_current_user),
+    service: JanusService = Depends(lambda: janus_service)
+):
+    async def events():
+        # 응답이 실제로 시작될 때 구독 (시작 전에 연결이 끊겨 generator가 돌지 않아도 구독이 남지 않도록)
+        subscriber = service.watchers.subscribe(room_id)
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), timeout=_settings.JANUS_WATCH_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        finally:
+            service.watchers.unsubscribe(room_id, subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 # UPDATE
 @router.patch(
     "/rooms/{room_id}",
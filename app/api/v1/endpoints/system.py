@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Response, status
+
+from app.api.deps import get_current_user
+from app.core.database import pool_stats
+from app.core.startup import startup_state
+from app.schemas.user import Principal
+
+router = APIRouter()
+
+@router.get("/ready", summary="워커 준비 상태 (스키마 확인과 prewarm이 끝나기 전에는 503)")
+async def get_ready(response: Response):
+    if not startup_state.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return startup_state.stats()
+
+@router.get("/db/stats", summary="DB 커넥션 풀 상태 조회 (사용 중/overflow 연결 수, 대기 시간, timeout, 로그인 필요)")
+async def get_db_stats(_user: Principal = Depends(get_current_user)):
+    return pool_stats()
@@ -2,13 +2,13 @@
 from fastapi import APIRouter, Depends, Request
 
 from app.api.deps import get_current_user
-from app.schemas.user import User
+from app.schemas.user import Principal
 from app.services import user_service
 
 router = APIRouter()
 
 @router.get("/me")
-async def me(request: Request, user: User = Depends(get_current_user)):
+async def me(request: Request, user: Principal = Depends(get_current_user)):
     return {"id": user.user_id, "name": user.user_name}
 
 # @router.get("/test")
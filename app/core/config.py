@@ -17,6 +17,126 @@ class Settings(BaseSettings):
     COOKIE_SAMESITE: str
     COOKIE_SECURE: bool
 
+    # DB 커넥션 풀 (워커 프로세스마다 따로 가짐)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0             # 연결을 기다리는 최대 시간(초)
+    DB_POOL_RECYCLE: int = 1800               # 이 시간(초)이 지난 연결은 다시 연결 (MySQL wait_timeout보다 짧게, -1이면 사용 안 함)
+    DB_POOL_LIVENESS: str = "idle"            # always(checkout마다 ping), idle(오래 쉰 연결만 ping), recycle(ping 없이 recycle만)
+    DB_POOL_PING_IDLE_SECONDS: float = 60.0   # idle 방식에서 ping 하는 유휴 시간 기준(초)
+    DB_SCHEMA_CHECK: str = "warn"              # 시작 시 alembic_version이 head인지 확인: warn(경고만), strict(다르면 시작 중단), off
+
+    # 읽기 전용 replica: 쉼표로 구분한 URL 목록 (비어 있으면 모든 쿼리가 primary로)
+    DATABASE_REPLICA_URLS: str = ""
+    DB_REPLICA_MAX_LAG_SECONDS: float = 5.0    # 이보다 뒤처진 replica는 제외
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0     # replica 상태/지연 확인 주기(초)
+    DB_READ_YOUR_WRITES_SECONDS: float = 10.0  # 사용자 정보가 바뀐 뒤 이 시간 동안은 primary에서 읽음
+
+    # Janus 클러스터: 쉼표로 구분한 여러 노드 URL (비어 있으면 JANUS_SERVER_URL 하나만 사용)
+    JANUS_SERVER_URLS: str = ""
+    JANUS_WS_URLS: str = ""               # websocket 사용 시 JANUS_SERVER_URLS와 같은 순서/개수
+    JANUS_ROOM_PLACEMENT: str = "hash"    # 새 방 배치: hash(consistent hash) 또는 least_loaded
+
+    # 노드별 videoroom 핸들 풀
+    JANUS_HANDLE_POOL_SIZE: int = 4
+    JANUS_HANDLES_PER_SESSION: int = 2
+    JANUS_STANDBY_SESSION: bool = False        # 장애 시 바로 교체할 예비 세션 유지
+    JANUS_RECOVERY_WAIT: float = 5.0           # 세션 복구 중 요청이 기다리는 최대 시간(초, 0이면 바로 503)
+    JANUS_RECOVERY_BASE_DELAY: float = 0.5     # 복구 재시도 지수 backoff 기준(초)
+    JANUS_RECOVERY_MAX_DELAY: float = 30.0
+
+    # 이벤트 기반 방/참여자 상태 사본 (Janus event handler를 POST /api/v1/janus/events 로 연결)
+    JANUS_STATE_MIRROR: bool = False
+    JANUS_STATE_RESYNC_INTERVAL: float = 60.0   # 전체 재동기화 주기(초)
+    JANUS_EVENTS_USER: str | None = None        # event handler backend_user/backend_pwd (둘 다 설정해야 /janus/events 사용 가능)
+    JANUS_EVENTS_PASSWORD: str | None = None
+
+    # 참여자 변화 스트림 (SSE)
+    JANUS_WATCH_INTERVAL: float = 2.0     # 상태 사본이 없을 때 방별 폴링 주기(초)
+    JANUS_WATCH_QUEUE_SIZE: int = 64      # 구독자별 대기 이벤트 수 (초과 시 스냅샷으로 대체)
+    JANUS_WATCH_HEARTBEAT: float = 15.0   # SSE keep-alive 주석 전송 주기(초)
+
+    # 일괄 처리 API
+    JANUS_BATCH_CONCURRENCY: int = 20     # Janus로 동시에 보내는 요청 수
+    JANUS_BATCH_MAX_ITEMS: int = 1000
+
+    # Janus transport: "http" (REST) 또는 "websocket" (연결 하나를 요청들이 공유)
+    JANUS_TRANSPORT: str = "http"
+    JANUS_WS_URL: str | None = None  # 예: ws://127.0.0.1:8188
+
+    # Janus HTTP 클라이언트 (커넥션 풀)
+    JANUS_HTTP_MAX_CONNECTIONS: int = 100
+    JANUS_HTTP_MAX_KEEPALIVE: int = 20
+    JANUS_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    JANUS_HTTP2: bool = False  # httpx[http2] (h2) 설치 필요
+    JANUS_CONNECT_TIMEOUT: float = 3.0
+    JANUS_READ_TIMEOUT: float = 5.0       # list / listparticipants
+    JANUS_WRITE_TIMEOUT: float = 10.0     # create / edit / destroy / attach
+    JANUS_KEEPALIVE_TIMEOUT: float = 3.0
+
+    # 차단기 / 적응형 타임아웃 / 재시도 (노드별)
+    JANUS_BREAKER_FAILURE_THRESHOLD: int = 5   # 연속 실패 횟수
+    JANUS_BREAKER_RESET_TIMEOUT: float = 10.0  # 열린 뒤 시험 요청까지 대기(초)
+    JANUS_ADAPTIVE_TIMEOUT: bool = True        # 위 READ/WRITE/KEEPALIVE 타임아웃을 상한으로 p99 기반 조정
+    JANUS_TIMEOUT_MULTIPLIER: float = 3.0      # 타임아웃 = p99 * 배수
+    JANUS_TIMEOUT_MIN: float = 0.5
+    JANUS_RETRY_MAX_ATTEMPTS: int = 2          # 읽기(list/listparticipants) 요청 재시도 횟수
+    JANUS_RETRY_BUDGET_RATIO: float = 0.1      # 요청당 적립되는 재시도 토큰
+    JANUS_RETRY_BASE_DELAY: float = 0.05       # jitter backoff 기준(초)
+
+    # 방 목록/참여자 목록 캐시 (TTL 0이면 비활성화)
+    JANUS_CACHE_TTL: float = 2.0
+    JANUS_CACHE_STALE_TTL: float = 10.0   # TTL 경과 후 이전 값을 반환하며 백그라운드 갱신하는 구간
+    JANUS_CACHE_MAX_ENTRIES: int = 1024
+
+    # 비밀번호 해시(bcrypt) 작업자 풀
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread 또는 process
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64       # 작업자가 모두 바쁠 때 대기 가능한 요청 수 (초과 시 503)
+    # bcrypt cost: 직접 지정하거나, 검증 지연 목표(ms)를 주면 시작 시 이 서버에서 측정해 결정
+    # (둘 다 없으면 passlib 기본값, 다른 cost로 저장된 해시는 로그인 성공 시 백그라운드로 다시 해시)
+    BCRYPT_ROUNDS: int | None = None
+    PASSWORD_HASH_TARGET_MS: float | None = None
+
+    # 로그인 시도 제한 (분당 허용 횟수, 0이면 해당 기준 비활성화)
+    LOGIN_THROTTLE_IP_PER_MINUTE: int = 30
+    LOGIN_THROTTLE_IP_BURST: int = 10
+    LOGIN_THROTTLE_ACCOUNT_PER_MINUTE: int = 10
+    LOGIN_THROTTLE_ACCOUNT_BURST: int = 5
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000     # 메모리에 추적하는 IP/계정 최대 개수
+    LOGIN_THROTTLE_BACKEND: str = "memory"    # memory 또는 redis (여러 워커가 한도 공유, redis 패키지 필요)
+    LOGIN_THROTTLE_REDIS_URL: str | None = None
+
+    # 인증 사용자 정보 캐시 (get_current_user, TTL 0이면 매 요청 DB 조회)
+    AUTH_PRINCIPAL_CACHE_TTL: float = 30.0
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # 폐기된 refresh token이 이 시간(초) 이후 다시 쓰이면 재사용(탈취)으로 보고 사용자 세션 전체 폐기
+    REFRESH_REUSE_GRACE_SECONDS: float = 10.0
+
+    # 만료/폐기된 refresh token 정리 (서버 안 주기 실행, 또는 python -m app.services.token_maintenance)
+    REFRESH_PURGE_ENABLED: bool = False
+    REFRESH_PURGE_INTERVAL: float = 3600.0
+    REFRESH_PURGE_BATCH_SIZE: int = 1000
+    REFRESH_PURGE_BATCH_SLEEP: float = 0.1          # 배치 사이 대기(초)
+    REFRESH_PURGE_REVOKED_RETENTION_DAYS: float = 1.0  # 폐기된 토큰 보관 기간 (재사용 감지에 사용)
+
+    # refresh token 저장소: mysql(기본, 테이블 직접 사용) 또는 memory(메모리 조회 + journal 기록 후 MySQL에 배치 반영, 워커 1개 전용)
+    REFRESH_TOKEN_STORE: str = "mysql"
+    REFRESH_STORE_JOURNAL_DIR: str = "refresh_journal"
+    REFRESH_STORE_JOURNAL_FSYNC: bool = True     # false면 OS 버퍼까지만 기록 (서버 자체 장애 시 최근 변경 유실 가능)
+    REFRESH_STORE_FLUSH_INTERVAL: float = 0.5    # MySQL 반영 주기(초)
+    REFRESH_STORE_FLUSH_BATCH_SIZE: int = 500    # 반영 트랜잭션 하나에 담는 변경 수
+
+    # stateless access token (사용자 정보를 토큰에 담고 DB 대신 인메모리 폐기 목록으로 확인)
+    AUTH_STATELESS_TOKENS: bool = False
+    AUTH_REVOCATION_REFRESH_INTERVAL: float = 5.0  # 폐기 목록 증분 갱신 주기(초)
+
+    # access token 비대칭 서명: JWT_ALG가 RS256/ES256이면 JWT_KEYS_DIR의 <kid>.pem 개인키로 서명 (JWT_SECRET은 쓰지 않음)
+    JWT_KEYS_DIR: str | None = None
+    JWT_ACTIVE_KID: str | None = None   # 서명에 쓸 kid (기본: 이름순 마지막 키)
+    JWKS_CACHE_MAX_AGE: int = 300       # JWKS 응답 Cache-Control max-age(초)
+
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
     # extra="ignore"는 .env 파일에 model_config에 정의되지 않은 변수가 있어도 무시하고 경고를 띄우지 않습니다.
 
@@ -1,5 +1,12 @@
 # app/core/database.py
+import time
+import asyncio
+import itertools
+from collections import deque
+
+from sqlalchemy import event, exc, text
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import get_settings
 from collections.abc import AsyncGenerator
@@ -7,11 +14,267 @@ from collections.abc import AsyncGenerator
 _settings = get_settings()
 Base = declarative_base()
 
-engine = create_async_engine(
-    _settings.DATABASE_URL, echo=False, pool_pre_ping=True
-)
+_WAIT_WINDOW = 1024  # 보관하는 최근 checkout 대기 시간 개수
+
+
+class PoolMetrics:
+    """커넥션 풀 checkout 대기 시간, timeout, 유휴 연결 확인(ping) 집계"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.pings = 0
+        self.ping_failures = 0
+        self._wait_seconds: deque = deque(maxlen=_WAIT_WINDOW)
+
+    def _percentile_ms(self, q: float) -> float | None:
+        if not self._wait_seconds:
+            return None
+        ordered = sorted(self._wait_seconds)
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+    def stats(self, pool) -> dict:
+        return {
+            "liveness": _settings.DB_POOL_LIVENESS,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(0, pool.overflow()),  # pool_size를 넘어 추가로 연 연결 수
+            "max_overflow": _settings.DB_MAX_OVERFLOW,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+            "wait_ms": {q: self._percentile_ms(v) for q, v in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))},
+        }
+
+
+pool_metrics = PoolMetrics()
+
+
+class MeasuredQueuePool(AsyncAdaptedQueuePool):
+    """checkout 대기 시간(새 연결을 만드는 시간 포함)과 pool_timeout 초과 횟수를 기록하는 풀"""
+
+    metrics = pool_metrics  # engine마다 _create_engine에서 지정 (기본 primary)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.checkouts += 1
+            self.metrics._wait_seconds.append(time.perf_counter() - started)
+
+
+if _settings.DB_POOL_LIVENESS not in ("always", "idle", "recycle"):
+    raise ValueError("DB_POOL_LIVENESS는 always, idle, recycle 중 하나여야 합니다.")
+
+
+def _watch_idle(async_engine, metrics: PoolMetrics):
+    """반납 시각을 기록하고, idle 방식이면 DB_POOL_PING_IDLE_SECONDS 이상 쉬었던 연결만 checkout 시 ping"""
+    sync_engine = async_engine.sync_engine
+
+    @event.listens_for(sync_engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        # 끊겨 있으면 버리고 풀이 새 연결로 다시 시도
+        if _settings.DB_POOL_LIVENESS != "idle":
+            return
+        idle_since = connection_record.info.get("checked_in_at")
+        if idle_since is None or time.monotonic() - idle_since < _settings.DB_POOL_PING_IDLE_SECONDS:
+            return
+        metrics.pings += 1
+        try:
+            sync_engine.dialect.do_ping(dbapi_connection)
+        except Exception:
+            metrics.ping_failures += 1
+            raise exc.DisconnectionError()
+
+
+def _create_engine(url: str, metrics: PoolMetrics):
+    """primary와 replica가 같은 풀 설정과 끊긴 연결 확인 방식을 쓰도록 engine 생성을 한곳에서 처리"""
+    async_engine = create_async_engine(
+        url,
+        echo=False,
+        poolclass=MeasuredQueuePool,
+        pool_size=_settings.DB_POOL_SIZE,
+        max_overflow=_settings.DB_MAX_OVERFLOW,
+        pool_timeout=_settings.DB_POOL_TIMEOUT,
+        pool_recycle=_settings.DB_POOL_RECYCLE,
+        # always: checkout마다 ping (이전 동작), idle/recycle: ping 왕복 없이 아래 이벤트 / pool_recycle 로 처리
+        pool_pre_ping=_settings.DB_POOL_LIVENESS == "always",
+    )
+    async_engine.sync_engine.pool.metrics = metrics
+    _watch_idle(async_engine, metrics)
+    return async_engine
+
+
+engine = _create_engine(_settings.DATABASE_URL, pool_metrics)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
+
+def _replica_name(replica) -> str:
+    return replica.url.host or replica.url.database
+
+
+class ReplicaSession(AsyncSession):
+    """읽기 전용 세션: replica에 연결하고, replica 연결 오류가 나면 primary로 바꿔 한 번 다시 실행"""
+
+    replica = None  # 연결된 replica engine (primary면 None)
+
+    async def use_primary(self):
+        if self.replica is None:
+            return
+        await self.close()
+        self.bind, self.sync_session.bind, self.replica = engine, engine.sync_engine, None
+
+    async def execute(self, *args, **kwargs):
+        try:
+            return await super().execute(*args, **kwargs)
+        except (exc.OperationalError, exc.InterfaceError, exc.TimeoutError) as e:
+            if self.replica is None:
+                raise
+            replica_router.mark_failed(self.replica, e)
+            await self.use_primary()
+            return await super().execute(*args, **kwargs)
+
+
+class ReplicaRouter:
+    """읽기 요청을 정상 replica에 돌아가며 배분
+
+    DB_REPLICA_CHECK_INTERVAL 마다 replica 지연(MySQL Seconds_Behind_Source)을 확인해
+    DB_REPLICA_MAX_LAG_SECONDS 를 넘거나 연결에 실패한 replica는 다음 확인까지 제외한다.
+    방금 바뀐 사용자 정보는 DB_READ_YOUR_WRITES_SECONDS 동안 primary에서 읽도록 note_write로 표시한다.
+    """
+
+    def __init__(self, urls: list[str]):
+        self.engines = [_create_engine(url, PoolMetrics()) for url in urls]
+        self._state = {id(e): {"healthy": True, "lag": None, "reads": 0, "failures": 0, "last_error": None} for e in self.engines}
+        self._cycle = itertools.cycle(self.engines)
+        self._recent_writes: dict[int, float] = {}
+        self._task: asyncio.Task | None = None
+        self.primary_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def choose(self):
+        """다음 정상 replica (없으면 None -> primary)"""
+        for _ in range(len(self.engines)):
+            replica = next(self._cycle)
+            state = self._state[id(replica)]
+            if state["healthy"]:
+                state["reads"] += 1
+                return replica
+        self.primary_reads += 1
+        return None
+
+    def mark_failed(self, replica, error: Exception):
+        state = self._state[id(replica)]
+        state["healthy"], state["last_error"] = False, str(error)
+        state["failures"] += 1
+        print(f"⚠️ DB replica {_replica_name(replica)} failed, reading from primary: {error}")
+
+    def note_write(self, key: int):
+        now = time.monotonic()
+        if len(self._recent_writes) > 10000:
+            self._recent_writes = {k: until for k, until in self._recent_writes.items() if until > now}
+        self._recent_writes[key] = now + _settings.DB_READ_YOUR_WRITES_SECONDS
+
+    def recently_written(self, key: int) -> bool:
+        until = self._recent_writes.get(key)
+        return until is not None and until > time.monotonic()
+
+    @staticmethod
+    async def _lag(replica) -> float:
+        async with replica.connect() as conn:
+            if replica.dialect.name != "mysql":
+                await conn.execute(text("SELECT 1"))
+                return 0.0
+            try:
+                row = (await conn.execute(text("SHOW REPLICA STATUS"))).mappings().first()
+            except exc.DBAPIError:
+                row = (await conn.execute(text("SHOW SLAVE STATUS"))).mappings().first()  # MySQL 8.0.22 이전
+        if row is None:
+            return 0.0
+        lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+        return float("inf") if lag is None else float(lag)  # None: 복제 중단
+
+    async def check(self):
+        for replica in self.engines:
+            state = self._state[id(replica)]
+            try:
+                state["lag"] = await asyncio.wait_for(self._lag(replica), timeout=_settings.DB_POOL_TIMEOUT)
+                state["healthy"] = state["lag"] <= _settings.DB_REPLICA_MAX_LAG_SECONDS
+                state["last_error"] = None if state["healthy"] else f"lag {state['lag']}s"
+            except Exception as e:
+                state["healthy"], state["lag"], state["last_error"] = False, None, str(e)
+
+    async def _check_loop(self):
+        while True:
+            await asyncio.sleep(_settings.DB_REPLICA_CHECK_INTERVAL)
+            await self.check()
+
+    async def start(self):
+        if not self.enabled:
+            return
+        await self.check()
+        print(f"✅ DB replicas: {[(_replica_name(e), self._state[id(e)]['healthy']) for e in self.engines]}")
+        self._task = asyncio.create_task(self._check_loop())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for replica in self.engines:
+            await replica.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "primary_reads": self.primary_reads,
+            "read_your_writes_keys": len(self._recent_writes),
+            "replicas": [
+                {
+                    "host": _replica_name(replica),
+                    **self._state[id(replica)],
+                    "pool": replica.sync_engine.pool.metrics.stats(replica.sync_engine.pool),
+                }
+                for replica in self.engines
+            ],
+        }
+
+
+replica_router = ReplicaRouter([u.strip() for u in _settings.DATABASE_REPLICA_URLS.split(",") if u.strip()])
+ReadSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=ReplicaSession)
+
+
+def pool_stats() -> dict:
+    stats = pool_metrics.stats(engine.sync_engine.pool)
+    if replica_router.enabled:
+        stats["replica_routing"] = replica_router.stats()
+    return stats
+
+
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db() -> AsyncGenerator[ReplicaSession, None]:
+    """읽기 전용 작업용 세션 (replica가 없거나 모두 비정상이면 primary)"""
+    replica = replica_router.choose() if replica_router.enabled else None
+    async with ReadSessionLocal(bind=replica or engine) as session:
+        session.replica = replica
+        yield session
@@ -0,0 +1,112 @@
+# app/core/jwt_keys.py
+"""access token 비대칭 서명 키 (RS256 / ES256)
+
+JWT_KEYS_DIR 안의 `<kid>.pem` 개인키를 읽어 JWT_ACTIVE_KID(없으면 이름순 마지막) 키로 서명하고,
+나머지 키는 검증과 JWKS 공개용으로만 쓴다. 키 객체는 처음 한 번만 파싱해 kid별로 보관한다.
+
+    python -m app.core.jwt_keys --alg ES256            # 새 키 생성 (kid = 생성 시각)
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+from jose.exceptions import JWTError
+
+from app.core.config import get_settings
+
+ASYMMETRIC_ALGS = {"RS256": rsa.RSAPrivateKey, "ES256": ec.EllipticCurvePrivateKey}
+
+
+class SigningKeys:
+    """kid -> 파싱된 서명/검증 키, 그리고 미리 만들어 둔 JWKS 응답"""
+
+    def __init__(self, keys_dir: str, alg: str, active_kid: str | None = None):
+        if alg not in ASYMMETRIC_ALGS:
+            raise ValueError(f"비대칭 서명은 {', '.join(ASYMMETRIC_ALGS)} 중 하나여야 합니다. (JWT_ALG={alg})")
+        self.alg = alg
+        self._signing: dict = {}
+        self._verifying: dict = {}
+        public_jwks = []
+        for name in sorted(os.listdir(keys_dir)):
+            if not name.endswith(".pem"):
+                continue
+            kid = name[:-4]
+            with open(os.path.join(keys_dir, name), "rb") as f:
+                pem = f.read()
+            private = serialization.load_pem_private_key(pem, password=None)
+            if not isinstance(private, ASYMMETRIC_ALGS[alg]):
+                raise ValueError(f"{name}: {alg} 에 맞지 않는 키 형식입니다.")
+            public_pem = private.public_key().public_bytes(
+                serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+            self._signing[kid] = jwk.construct(pem, alg)
+            self._verifying[kid] = jwk.construct(public_pem, alg)
+            public_jwks.append({**self._verifying[kid].to_dict(), "kid": kid, "use": "sig"})
+        if not self._signing:
+            raise ValueError(f"JWT_KEYS_DIR({keys_dir})에 .pem 키가 없습니다.")
+        self.active_kid = active_kid or sorted(self._signing)[-1]
+        if self.active_kid not in self._signing:
+            raise ValueError(f"JWT_ACTIVE_KID({self.active_kid}) 키 파일이 없습니다.")
+        # 요청마다 직렬화하지 않도록 JWKS 응답 본문과 ETag를 미리 만들어 둠
+        self.jwks_body = json.dumps({"keys": public_jwks}, separators=(",", ":")).encode()
+        self.jwks_etag = '"' + hashlib.sha256(self.jwks_body).hexdigest()[:32] + '"'
+
+    @property
+    def kids(self) -> list[str]:
+        return list(self._verifying)
+
+    def signing_key(self):
+        return self.active_kid, self._signing[self.active_kid]
+
+    def verifying_key(self, kid: str | None):
+        key = self._verifying.get(kid)
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return key
+
+
+_signing_keys: SigningKeys | None = None
+
+
+def get_signing_keys() -> SigningKeys | None:
+    """비대칭 알고리즘이면 키 묶음(처음 호출 시 한 번 적재), HS* 이면 None"""
+    global _signing_keys
+    s = get_settings()
+    if s.JWT_ALG not in ASYMMETRIC_ALGS:
+        return None
+    if _signing_keys is None:
+        if not s.JWT_KEYS_DIR:
+            raise ValueError(f"JWT_ALG={s.JWT_ALG} 사용 시 JWT_KEYS_DIR가 필요합니다.")
+        _signing_keys = SigningKeys(s.JWT_KEYS_DIR, s.JWT_ALG, s.JWT_ACTIVE_KID)
+    return _signing_keys
+
+
+def generate_key(alg: str) -> bytes:
+    if alg == "RS256":
+        private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        private = ec.generate_private_key(ec.SECP256R1())
+    return private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="access token 서명 키 생성")
+    parser.add_argument("--alg", choices=list(ASYMMETRIC_ALGS), default="ES256")
+    parser.add_argument("--dir", default=os.getenv("JWT_KEYS_DIR") or "keys", help="키를 저장할 디렉터리 (기본 JWT_KEYS_DIR)")
+    parser.add_argument("--kid", default=None, help="키 id (기본 생성 시각, 예: 20261018-093000)")
+    args = parser.parse_args(sys.argv[1:])
+    kid = args.kid or datetime.now().strftime("%Y%m%d-%H%M%S")
+    os.makedirs(args.dir, exist_ok=True)
+    path = os.path.join(args.dir, f"{kid}.pem")
+    with open(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "wb") as f:
+        f.write(generate_key(args.alg))
+    print(f"✅ {args.alg} signing key created: {path} (kid={kid})")
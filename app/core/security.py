@@ -1,13 +1,24 @@
-import secrets, hashlib
-from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+import os, secrets, hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import get_settings
+from app.core.jwt_keys import get_signing_keys
 
 pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if get_settings().BCRYPT_ROUNDS:
+    pwd_ctx.update(bcrypt__rounds=get_settings().BCRYPT_ROUNDS)
+
+def set_bcrypt_rounds(rounds: int) -> None:
+    # 이후 새로 뜨는 해시 작업자 프로세스도 같은 값을 쓰도록 환경 변수에도 기록
+    os.environ["BCRYPT_ROUNDS"] = str(rounds)
+    pwd_ctx.update(bcrypt__rounds=rounds)
+
+def bcrypt_rounds() -> int:
+    return pwd_ctx.handler("bcrypt").default_rounds
 
 def hash_password(p: str) -> str:
     return pwd_ctx.hash(p)
@@ -15,31 +26,68 @@ def hash_password(p: str) -> str:
 def verify_password(p: str, hp: str) -> bool:
     return pwd_ctx.verify(p, hp)
 
+def password_needs_rehash(hp: str) -> bool:
+    # 로그인 성공 시 현재 bcrypt cost로 다시 해시할지
+    # BCRYPT_ROUNDS를 직접 지정했으면 그 값과 다른 해시 모두 (cost를 낮춘 경우도 반영)
+    # 워커마다 시작 시 측정한 cost라면 서로의 해시를 번갈아 되돌리지 않도록 더 낮은 해시만
+    if get_settings().BCRYPT_ROUNDS or pwd_ctx.identify(hp) != "bcrypt":
+        return pwd_ctx.needs_update(hp)
+    return pwd_ctx.handler("bcrypt").from_string(hp).rounds < bcrypt_rounds()
+
 def utcnow_naive() -> datetime:
     # DB에 naive UTC로 저장
     return datetime.now()
 
 def make_access_token(sub: str, extra: Optional[Dict[str, Any]] = None) -> str:
     s = get_settings()
+    # jose는 naive datetime을 UTC로 해석하므로 exp는 UTC 기준 aware datetime으로 만듦
+    now = datetime.now(timezone.utc)
     payload: Dict[str, Any] = {
         "sub": sub,
         "typ": "access",
-        "iat": int(datetime.now().timestamp()),
-        "exp": datetime.now() + timedelta(minutes=s.ACCESS_EXPIRE_MINUTES),
+        "iat": int(now.timestamp()),
+        "exp": now + timedelta(minutes=s.ACCESS_EXPIRE_MINUTES),
     }
     if extra:
         payload.update(extra)
-    return jwt.encode(payload, s.JWT_SECRET, algorithm=s.JWT_ALG)
+    keys = get_signing_keys()
+    if keys is None:
+        return jwt.encode(payload, s.JWT_SECRET, algorithm=s.JWT_ALG)
+    kid, key = keys.signing_key()
+    return jwt.encode(payload, key, algorithm=s.JWT_ALG, headers={"kid": kid})
 
 def decode_access_token(token: str) -> Dict[str, Any]:
     s = get_settings()
-    return jwt.decode(token, s.JWT_SECRET, algorithms=[s.JWT_ALG])
+    keys = get_signing_keys()
+    if keys is None:
+        return jwt.decode(token, s.JWT_SECRET, algorithms=[s.JWT_ALG])
+    # header의 kid로 미리 파싱해 둔 공개키를 골라 검증 (교체 중인 이전 키로 서명된 토큰도 통과)
+    key = keys.verifying_key(jwt.get_unverified_header(token).get("kid"))
+    return jwt.decode(token, key, algorithms=[s.JWT_ALG])
 
 def new_refresh_plain() -> str:
     return secrets.token_urlsafe(32)
 
-def new_jti() -> str:
-    return secrets.token_hex(16)  # 32 chars
+SESSION_ID_LENGTH = 16
+
+def new_jti(session_id: Optional[str] = None) -> str:
+    # 32 chars: 앞 16자는 로그인 세션 id (회전해도 이어받음), 뒤 16자는 토큰마다 새로 생성
+    return (session_id or secrets.token_hex(8)) + secrets.token_hex(8)
+
+def session_id_of(jti: str) -> str:
+    # access token의 sid (이전 형식 jti/sid도 앞 16자를 세션 id로 봄)
+    return jti[:SESSION_ID_LENGTH]
+
+def make_refresh_cookie(user_id: int, jti: str, plain: str) -> str:
+    # 쿠키에 user id와 jti를 함께 담아 조회 없이 jti(unique index)로 바로 회전/폐기
+    return f"{user_id}.{jti}.{plain}"
+
+def parse_refresh_cookie(value: str) -> Optional[Tuple[int, str, str]]:
+    """(user_id, jti, plain) 반환, 이전 형식(plain만 있는 쿠키)이면 None"""
+    parts = value.split(".", 2)
+    if len(parts) != 3 or not parts[0].isdigit():
+        return None
+    return int(parts[0]), parts[1], parts[2]
 
 def hash_refresh(plain: str) -> str:
     s = get_settings()
@@ -0,0 +1,91 @@
+# app/core/startup.py
+
+import os
+import time
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from sqlalchemy import text
+
+from app.core.config import get_settings
+from app.core.database import engine
+
+_settings = get_settings()
+
+_ALEMBIC_INI = os.path.join(os.path.dirname(__file__), "..", "..", "alembic.ini")
+
+
+class StartupState:
+    """워커 시작 단계별 소요 시간과 준비 완료 여부 (readiness 엔드포인트에서 사용)"""
+
+    def __init__(self):
+        self.ready = False
+        self.phases: dict[str, float] = {}
+        self.errors: dict[str, str] = {}
+        self._started = time.perf_counter()
+
+    @asynccontextmanager
+    async def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.errors[name] = str(e)
+            raise
+        finally:
+            self.phases[name] = round((time.perf_counter() - started) * 1000, 1)
+            print(f"⏱️ Startup phase {name}: {self.phases[name]}ms")
+
+    def mark_ready(self):
+        self.ready = True
+        # total은 앱 모듈을 불러온 시점부터 (import 시간 포함)
+        self.phases["total"] = round((time.perf_counter() - self._started) * 1000, 1)
+        print(f"✅ Worker ready in {self.phases['total']}ms {self.phases}")
+
+    def stats(self) -> dict:
+        return {"ready": self.ready, "phases_ms": self.phases, "errors": self.errors}
+
+
+startup_state = StartupState()
+
+
+def _alembic_head() -> str:
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(Config(_ALEMBIC_INI)).get_current_head()
+
+
+async def check_schema_version():
+    """DB의 alembic_version이 migrations 디렉터리의 head와 같은지 쿼리 한 번으로 확인
+
+    warn(기본): 다르면 경고만 남기고 계속, strict: 다르면 시작 중단, off: 확인하지 않음
+    """
+    mode = _settings.DB_SCHEMA_CHECK
+    if mode not in ("warn", "strict", "off"):
+        raise ValueError("DB_SCHEMA_CHECK는 warn, strict, off 중 하나여야 합니다.")
+    if mode == "off":
+        return
+    head = _alembic_head()
+    try:
+        async with engine.connect() as conn:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar_one_or_none()
+    except Exception as e:
+        problem = f"DB schema version을 확인할 수 없습니다 (alembic upgrade head 필요): {e}"
+    else:
+        if current == head:
+            return
+        problem = f"DB schema revision {current} 이(가) head {head} 와 다릅니다. alembic upgrade head 를 먼저 실행하세요."
+    if mode == "strict":
+        raise RuntimeError(problem)
+    print(f"⚠️ {problem}")
+
+
+async def prewarm_db_pool(size: int):
+    """풀 크기만큼 연결을 동시에 열었다가 반납해 첫 요청들이 연결 생성을 기다리지 않도록 함"""
+    async def _open(stack: AsyncExitStack):
+        conn = await stack.enter_async_context(engine.connect())
+        await conn.execute(text("SELECT 1"))
+
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(_open(stack) for _ in range(max(0, size))))
@@ -1,8 +1,63 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.openapi.utils import get_openapi
 from app.api.v1.api import api_router
 from app.core.config import get_settings
-from app.core.database import Base, engine
-from fastapi.openapi.utils import get_openapi
+from app.core.database import engine, replica_router
+from app.core.startup import check_schema_version, prewarm_db_pool, startup_state
+from app.core.jwt_keys import get_signing_keys
+from app.services.janus_service import janus_service
+from app.services.password_hasher import password_hasher
+from app.services.token_revocation import token_revocations
+from app.services.token_maintenance import refresh_token_purger
+from app.services.refresh_token_store import refresh_token_store
+
+_settings = get_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 시작 단계 중간에 실패해도 이미 시작한 서비스(백그라운드 작업, 연결)가 남지 않도록 같은 finally에서 정리
+    try:
+        # 스키마는 alembic으로만 관리 (create_all 대신 head revision만 확인)
+        async with startup_state.phase("schema"):
+            await check_schema_version()
+        async with startup_state.phase("services"):
+            signing_keys = get_signing_keys()  # 키 파일 문제는 첫 로그인이 아니라 시작 시 드러나도록 미리 적재
+            if signing_keys:
+                print(f"✅ JWT signing keys loaded: {signing_keys.kids} (active {signing_keys.active_kid})")
+            await password_hasher.calibrate()
+            await janus_service.start()
+            await refresh_token_store.start()
+            await replica_router.start()
+            if _settings.AUTH_STATELESS_TOKENS:
+                await token_revocations.start()
+            if _settings.REFRESH_PURGE_ENABLED:
+                refresh_token_purger.start()
+        # DB 연결, Janus 세션/핸들, bcrypt 작업자 풀을 동시에 미리 준비한 뒤 ready
+        async with startup_state.phase("prewarm"):
+            warm_ups = [
+                asyncio.ensure_future(prewarm_db_pool(_settings.DB_POOL_SIZE)),
+                asyncio.ensure_future(janus_service.warm_up()),
+                asyncio.ensure_future(password_hasher.warm_up()),
+            ]
+            try:
+                await asyncio.gather(*warm_ups)
+            except BaseException:
+                for task in warm_ups:  # 하나가 실패하면 나머지 준비 작업도 멈춤
+                    task.cancel()
+                raise
+        startup_state.mark_ready()
+        yield
+    finally:
+        startup_state.ready = False
+        await refresh_token_purger.close()
+        await token_revocations.close()
+        await refresh_token_store.close()
+        await janus_service.close()
+        password_hasher.close()
+        await replica_router.close()
+        await engine.dispose()
 
 # FastAPI 애플리케이션 생성
 app = FastAPI(
@@ -11,7 +66,8 @@ app = FastAPI(
     version="1.0.0",
     openapi_url="/api/openapi.json",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 def custom_openapi():
@@ -29,11 +85,6 @@ def custom_openapi():
 
 app.openapi = custom_openapi
 
-@app.on_event("startup")
-async def on_startup():
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
 # v1 API 라우터를 메인 앱에 포함
 app.include_router(api_router, prefix="/api/v1")
 
@@ -6,7 +6,7 @@ class User(Base):
     __tablename__ = "user"
 
     id = Column(Integer, primary_key=True, autoincrement="auto")
-    user_id = Column(String(255), nullable=False)
+    user_id = Column(String(255), nullable=False, unique=True, index=True)
     user_pwd = Column(String(255), index=False, nullable=False)
     user_name = Column(String(255), nullable=False)
     user_number = Column(String(255), nullable=False)
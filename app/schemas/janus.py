@@ -17,6 +17,19 @@ class RoomUpdateRequest(BaseModel):
 class RoomDestroyRequest(BaseModel):
     secret: Optional[str] = Field(None, description="방 삭제에 필요한 비밀번호")
 
+class RoomBatchDestroyItem(BaseModel):
+    room_id: int = Field(..., description="삭제할 방 ID")
+    secret: Optional[str] = Field(None, description="방 삭제에 필요한 비밀번호")
+
+class RoomBatchCreateRequest(BaseModel):
+    rooms: List[RoomCreateRequest] = Field(..., min_length=1, description="생성할 방 목록")
+
+class RoomBatchDestroyRequest(BaseModel):
+    rooms: List[RoomBatchDestroyItem] = Field(..., min_length=1, description="삭제할 방 목록")
+
+class RoomBatchParticipantsRequest(BaseModel):
+    room_ids: List[int] = Field(..., min_length=1, description="참여자를 조회할 방 ID 목록")
+
 
 # --- 응답 스키마 ---
 
@@ -31,4 +44,33 @@ class ParticipantDetails(BaseModel):
     display: str = Field(..., description="참여자 표시 이름")
 
 class SuccessResponse(BaseModel):
-    status: str = "success"
\ No newline at end of file
+    status: str = "success"
+
+class BatchItemResult(BaseModel):
+    index: int = Field(..., description="요청 목록에서의 순서")
+    ok: bool = Field(..., description="성공 여부")
+    status_code: int = Field(..., description="개별 처리 결과 HTTP 상태 코드")
+    error: Optional[str] = Field(None, description="실패 사유")
+
+class RoomBatchCreateResult(BatchItemResult):
+    room: Optional[RoomDetailsResponse] = None
+
+class RoomBatchDestroyResult(BatchItemResult):
+    room_id: int
+
+class RoomBatchParticipantsResult(BatchItemResult):
+    room_id: int
+    participants: Optional[List[ParticipantDetails]] = None
+
+class BatchResponse(BaseModel):
+    total: int
+    succeeded: int
+    failed: int
+class RoomBatchCreateResponse(BatchResponse):
+    results: List[RoomBatchCreateResult]
+
+class RoomBatchDestroyResponse(BatchResponse):
+    results: List[RoomBatchDestroyResult]
+
+class RoomBatchParticipantsResponse(BatchResponse):
+    results: List[RoomBatchParticipantsResult]
@@ -15,4 +15,9 @@ class User(UserBase):
   id: int
 
   class Config:
-    from_attributes = True
\ No newline at end of file
+    from_attributes = True
+
+class Principal(User):
+  """인증된 요청의 사용자 정보 (get_current_user가 필요한 컬럼만 조회)"""
+  couple_id: Optional[int] = None
+  is_active: bool
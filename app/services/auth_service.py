@@ -1,32 +1,65 @@
+import asyncio
 from datetime import timedelta
 from typing import Optional, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
 from app.core.security import (
-    hash_password,
-    verify_password,
     make_access_token,
     new_refresh_plain,
     new_jti,
+    session_id_of,
     hash_refresh,
+    make_refresh_cookie,
+    parse_refresh_cookie,
+    password_needs_rehash,
     utcnow_naive,
 )
 from app.models.user import User
-from app.models.refresh_token import RefreshToken
+from app.services.password_hasher import password_hasher
+from app.services.refresh_token_store import refresh_token_store
+from app.services.token_revocation import token_revocations
 
 _settings = get_settings()
 
+_rehash_tasks: set[asyncio.Task] = set()  # 진행 중인 백그라운드 재해시 (GC로 취소되지 않도록 참조 보관)
+
+# stateless 모드: 인증 시 DB 조회 없이 쓸 사용자 정보를 access token에 포함
+# (sid = 로그인 세션 id, 함께 발급한 refresh token jti의 앞부분이며 회전해도 유지)
+def _access_claims(user, jti: str) -> Optional[dict]:
+    if not _settings.AUTH_STATELESS_TOKENS:
+        return None
+    return {"uid": user.user_id, "name": user.user_name, "cid": user.couple_id, "act": user.is_active, "sid": session_id_of(jti)}
+
 # 회원가입
 async def register_user(db: AsyncSession, user_id: str, user_name: str, user_pwd: str, user_number: str, user_gender: int) -> None:
-    exists = await db.execute(select(User).where(User.user_id == user_id))
-    if exists.scalar_one_or_none():
-        raise ValueError("ID already registered")
-    user = User(user_id=user_id, user_name=user_name, user_pwd=hash_password(user_pwd), user_number=user_number, user_gender=user_gender)
+    # 중복 확인 SELECT 없이 바로 insert (user_id unique index가 중복을 막음)
+    user = User(user_id=user_id, user_name=user_name, user_pwd=await password_hasher.hash(user_pwd), user_number=user_number, user_gender=user_gender)
     db.add(user)
-    await db.commit()
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise ValueError("ID already registered")
+
+async def _rehash_password(user_pk: int, password: str, old_hash: str) -> None:
+    """현재 bcrypt cost로 다시 해시해 저장 (그 사이 비밀번호가 바뀌었으면 덮어쓰지 않음)"""
+    try:
+        new_hash = await password_hasher.hash(password)
+        async with AsyncSessionLocal() as db:
+            res = await db.execute(
+                update(User).where(User.id == user_pk, User.user_pwd == old_hash).values(user_pwd=new_hash)
+            )
+            await db.commit()
+        if res.rowcount:
+            password_hasher.rehashed += 1
+    except Exception as e:
+        # 작업자 풀이 바쁘거나(503) DB 오류면 다음 로그인 때 다시 시도
+        print(f"⚠️ Password rehash skipped for user {user_pk}: {e}")
 
 # 로그인: access, refresh(plain) 발급 및 refresh 저장
 async def login_issue_tokens(
@@ -38,27 +71,46 @@ async def login_issue_tokens(
 ) -> Tuple[str, int, str, int]:
     res = await db.execute(select(User).where(User.user_id == user_id))
     user = res.scalar_one_or_none()
-    if not user or not verify_password(password, user.user_pwd):
+    if not user or not await password_hasher.verify(password, user.user_pwd):
         raise PermissionError("Invalid id or password")
     if not user.is_active:
         raise PermissionError("User inactive")
+    if password_needs_rehash(user.user_pwd):
+        task = asyncio.create_task(_rehash_password(user.id, password, user.user_pwd))
+        _rehash_tasks.add(task)
+        task.add_done_callback(_rehash_tasks.discard)
 
-    access = make_access_token(str(user.id))
     refresh_plain = new_refresh_plain()
+    jti = new_jti()
+    access = make_access_token(str(user.id), _access_claims(user, jti))
+
+    await refresh_token_store.issue(db, {
+        "jti": jti,
+        "user_id": user.id,
+        "hashed_token": hash_refresh(refresh_plain),
+        "user_agent": user_agent,
+        "ip": ip,
+        "created_at": utcnow_naive(),
+        "expires_at": utcnow_naive() + timedelta(days=_settings.REFRESH_EXPIRE_DAYS),
+    })
 
-    rt = RefreshToken(
-        jti=new_jti(),
-        user_id=user.id,
-        hashed_token=hash_refresh(refresh_plain),
-        user_agent=user_agent,
-        ip=ip,
-        created_at=utcnow_naive(),
-        expires_at=utcnow_naive() + timedelta(days=_settings.REFRESH_EXPIRE_DAYS),
-    )
-    db.add(rt)
-    await db.commit()
+    refresh_cookie = make_refresh_cookie(user.id, jti, refresh_plain)
+    return access, _settings.ACCESS_EXPIRE_MINUTES * 60, refresh_cookie, _settings.REFRESH_EXPIRE_DAYS * 24 * 3600
 
-    return access, _settings.ACCESS_EXPIRE_MINUTES * 60, refresh_plain, _settings.REFRESH_EXPIRE_DAYS * 24 * 3600
+async def _resolve_refresh_cookie(db: AsyncSession, refresh_cookie: str) -> Optional[Tuple[int, str, str]]:
+    """쿠키에서 (user_id, jti, hashed_token) 추출 (이전 형식 쿠키는 hashed_token으로 한번 조회)"""
+    parsed = parse_refresh_cookie(refresh_cookie)
+    if parsed:
+        user_id, jti, plain = parsed
+        return user_id, jti, hash_refresh(plain)
+    hashed = hash_refresh(refresh_cookie)
+    found = await refresh_token_store.find_by_hash(db, hashed)
+    return (*found, hashed) if found else None
+
+async def _revoke_all_for_user(db: AsyncSession, user_id: int) -> None:
+    """refresh token 재사용이 감지되면 해당 사용자의 살아 있는 refresh token을 모두 폐기"""
+    for jti in await refresh_token_store.revoke_user(db, user_id):
+        token_revocations.revoke_session(session_id_of(jti))
 
 # 리프레시 회전
 async def rotate_refresh(
@@ -67,50 +119,54 @@ async def rotate_refresh(
     user_agent: Optional[str],
     ip: Optional[str],
 ) -> Tuple[str, int, str, int]:
-    hashed = hash_refresh(refresh_plain)
-
-    res = await db.execute(
-        select(RefreshToken).where(
-            RefreshToken.hashed_token == hashed,
-            RefreshToken.revoked_at.is_(None),
-            RefreshToken.expires_at > utcnow_naive(),
-        )
-    )
-    current = res.scalar_one_or_none()
-    if not current:
+    resolved = await _resolve_refresh_cookie(db, refresh_plain)
+    if not resolved:
         raise PermissionError("Invalid refresh token")
+    user_id, jti, hashed = resolved
 
-    # revoke old
-    current.revoked_at = utcnow_naive()
+    # stateless 모드는 새 access token에 넣을 사용자 정보가 필요 (비활성 사용자는 회전 거부)
+    user = None
+    if _settings.AUTH_STATELESS_TOKENS:
+        res = await db.execute(
+            select(User.user_id, User.user_name, User.couple_id, User.is_active).where(User.id == user_id)
+        )
+        user = res.one_or_none()
+        if not user or not user.is_active:
+            raise PermissionError("User inactive")
 
-    # issue new refresh
+    now = utcnow_naive()
     new_plain = new_refresh_plain()
-    new_rt = RefreshToken(
-        jti=new_jti(),
-        user_id=current.user_id,
-        hashed_token=hash_refresh(new_plain),
-        user_agent=user_agent,
-        ip=ip,
-        created_at=utcnow_naive(),
-        expires_at=utcnow_naive() + timedelta(days=_settings.REFRESH_EXPIRE_DAYS),
-    )
-    db.add(new_rt)
-    await db.commit()
+    new_jti_value = new_jti(session_id_of(jti))  # 같은 로그인 세션을 이어감
+    new_row = {
+        "jti": new_jti_value,
+        "user_id": user_id,
+        "hashed_token": hash_refresh(new_plain),
+        "user_agent": user_agent,
+        "ip": ip,
+        "created_at": now,
+        "expires_at": now + timedelta(days=_settings.REFRESH_EXPIRE_DAYS),
+    }
+    # 현재 토큰 폐기 + 새 토큰 저장 (같은 토큰으로 동시에 회전하면 한 요청만 성공)
+    if not await refresh_token_store.rotate(db, user_id, jti, hashed, now, new_row):
+        revoked_at = await refresh_token_store.revoked_at(db, user_id, jti, hashed)
+        # 동시 회전(grace 이내)은 단순 실패, 그 이후 폐기된 토큰이 다시 쓰이면 탈취로 보고 전부 폐기
+        if revoked_at and now - revoked_at > timedelta(seconds=_settings.REFRESH_REUSE_GRACE_SECONDS):
+            print(f"⚠️ Refresh token reuse detected for user {user_id}, revoking all sessions")
+            await _revoke_all_for_user(db, user_id)
+            raise PermissionError("Refresh token reuse detected")
+        raise PermissionError("Invalid refresh token")
+    # 회전은 세션을 끝내지 않으므로 이전 access token은 만료까지 그대로 유효 (폐기는 로그아웃/재사용 감지 시에만)
 
     # new access
-    access = make_access_token(str(current.user_id))
-    return access, _settings.ACCESS_EXPIRE_MINUTES * 60, new_plain, _settings.REFRESH_EXPIRE_DAYS * 24 * 3600
+    access = make_access_token(str(user_id), _access_claims(user, new_jti_value) if user else None)
+    new_cookie = make_refresh_cookie(user_id, new_jti_value, new_plain)
+    return access, _settings.ACCESS_EXPIRE_MINUTES * 60, new_cookie, _settings.REFRESH_EXPIRE_DAYS * 24 * 3600
 
 # 로그아웃(리프레시 폐기)
 async def revoke_refresh(db: AsyncSession, refresh_plain: str) -> None:
-    hashed = hash_refresh(refresh_plain)
-    res = await db.execute(
-        select(RefreshToken).where(
-            RefreshToken.hashed_token == hashed,
-            RefreshToken.revoked_at.is_(None),
-        )
-    )
-    rt = res.scalar_one_or_none()
-    if rt:
-        rt.revoked_at = utcnow_naive()
-        await db.commit()
+    resolved = await _resolve_refresh_cookie(db, refresh_plain)
+    if not resolved:
+        return
+    user_id, jti, hashed = resolved
+    if await refresh_token_store.revoke(db, user_id, jti, hashed):
+        token_revocations.revoke_session(session_id_of(jti))
@@ -0,0 +1,174 @@
+# app/services/janus_cache.py
+
+import time
+import asyncio
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "stale_until")
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class JanusCache:
+    """방 목록/참여자 목록 조회 결과 캐시 (TTL + stale-while-revalidate + LRU 개수 제한)
+
+    - TTL 이내: 캐시 값 반환 (hit)
+    - TTL 경과 후 stale 구간: 이전 값을 바로 반환하고 백그라운드에서 갱신 (stale)
+    - 그 이후/없음: Janus 조회 후 저장 (miss)
+    쓰기 요청(create/edit/destroy)은 invalidate로 해당 키만 정확히 무효화한다.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        # invalidate 이후에 끝난 조회 결과가 캐시에 덮어쓰이지 않도록 키별 세대 번호 관리
+        # (세대는 조회가 진행 중인 키에만 필요하므로 마지막 조회가 끝나면 지움 -> 크기는 진행 중인 조회 수로 제한)
+        self._generations: dict[Hashable, int] = {}
+        self._loading: dict[Hashable, int] = {}
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await loader()
+
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.fresh_until:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if now < entry.stale_until:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._refreshing:
+                    self._refreshing[key] = asyncio.create_task(self._refresh(key, loader))
+                return entry.value
+
+        self.misses += 1
+        generation = self._begin_load(key)
+        try:
+            value = await loader()
+            self._store(key, value, generation)
+        finally:
+            self._end_load(key)
+        return value
+
+    async def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]):
+        generation = self._begin_load(key)
+        try:
+            self._store(key, await loader(), generation)
+        except Exception as e:
+            # 갱신 실패 시 stale 값을 그대로 두고 다음 요청에서 재시도
+            print(f"⚠️ Janus cache refresh failed for {key}: {e}")
+        finally:
+            self._end_load(key)
+            self._refreshing.pop(key, None)
+
+    def _begin_load(self, key: Hashable) -> int:
+        self._loading[key] = self._loading.get(key, 0) + 1
+        return self._generations.get(key, 0)
+
+    def _end_load(self, key: Hashable):
+        remaining = self._loading.pop(key) - 1
+        if remaining:
+            self._loading[key] = remaining
+        else:
+            self._generations.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any, generation: int):
+        if self._generations.get(key, 0) != generation:
+            return
+        now = time.monotonic()
+        self._entries[key] = _Entry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *keys: Hashable):
+        for key in keys:
+            if key in self._loading:  # 진행 중인 조회 결과만 버리면 되므로 그때만 세대를 올림
+                self._generations[key] = self._generations.get(key, 0) + 1
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        for key in list(self._entries):
+            self.invalidate(key)
+        for task in self._refreshing.values():
+            task.cancel()
+        self._refreshing.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "max_entries": self.max_entries,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+class SingleFlight:
+    """동일한 읽기 요청(요청 종류 + 방)이 동시에 들어오면 Janus 호출 하나를 공유"""
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.collapsed = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.calls += 1
+        task = self._inflight.get(key)
+        if task is None:
+            # 호출한 요청이 취소되어도 함께 기다리는 요청들은 결과를 받도록 별도 task로 실행
+            task = asyncio.create_task(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.collapsed += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # 기다리는 요청이 없어도 "exception never retrieved" 경고가 나지 않도록
+
+    def forget(self, *keys: Hashable):
+        """쓰기 이후의 요청이 쓰기 이전에 시작된 조회 결과를 공유하지 않도록 분리"""
+        for key in keys:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._inflight),
+            "calls": self.calls,
+            "collapsed": self.collapsed,
+            "upstream_calls": self.calls - self.collapsed,
+        }
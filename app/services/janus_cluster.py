@@ -0,0 +1,459 @@
+# app/services/janus_cluster.py
+
+import bisect
+import hashlib
+import time
+import random
+import string
+import asyncio
+from fastapi import HTTPException, status
+from app.core.config import get_settings
+from app.services.janus_transport import (
+    JANUS_ERROR_HANDLE_NOT_FOUND,
+    JANUS_ERROR_SESSION_NOT_FOUND,
+    JanusConnectionLost,
+    JanusError,
+    JanusTimeout,
+    _operation,
+    build_transport,
+)
+from app.services.janus_resilience import (
+    IDEMPOTENT_OPERATIONS,
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    RetryBudget,
+    is_transport_failure,
+)
+
+settings = get_settings()
+
+_VIRTUAL_NODES = 128  # 노드당 링 위 가상 노드 수 (분포 균등화)
+_MAX_ROOM_ID = 2**31 - 1
+
+
+# ( _generate_transaction_id 함수는 그대로 사용 )
+def _generate_transaction_id(length: int = 12) -> str:
+    return "".join(random.choice(string.ascii_letters + string.digits) for _ in range(length))
+
+
+def _split_urls(value: str | None) -> list[str]:
+    return [url.strip() for url in (value or "").split(",") if url.strip()]
+
+
+def janus_node_urls() -> list[tuple[str, str | None]]:
+    """(HTTP URL, WebSocket URL) 목록. JANUS_SERVER_URLS가 없으면 JANUS_SERVER_URL 하나를 사용"""
+    http_urls = _split_urls(settings.JANUS_SERVER_URLS) or [settings.JANUS_SERVER_URL]
+    ws_urls = _split_urls(settings.JANUS_WS_URLS) or _split_urls(settings.JANUS_WS_URL)
+    if ws_urls and len(ws_urls) != len(http_urls):
+        raise ValueError("JANUS_WS_URLS 개수는 JANUS_SERVER_URLS 개수와 같아야 합니다.")
+    return [(url, ws_urls[i] if ws_urls else None) for i, url in enumerate(http_urls)]
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """room id -> 노드 매핑용 consistent hash ring"""
+
+    def __init__(self, names: list[str], virtual_nodes: int = _VIRTUAL_NODES):
+        points = sorted((_hash(f"{name}#{i}"), name) for name in names for i in range(virtual_nodes))
+        self._keys = [p[0] for p in points]
+        self._names = [p[1] for p in points]
+
+    def lookup(self, key) -> str:
+        idx = bisect.bisect(self._keys, _hash(str(key))) % len(self._keys)
+        return self._names[idx]
+
+
+class _Handle:
+    """세션에 attach된 videoroom 플러그인 핸들 하나와 사용 통계"""
+
+    __slots__ = ("session_id", "handle_id", "in_flight", "requests", "errors")
+
+    def __init__(self, session_id: int, handle_id: int):
+        self.session_id = session_id
+        self.handle_id = handle_id
+        self.in_flight = 0
+        self.requests = 0
+        self.errors = 0
+
+    def stats(self) -> dict:
+        # Janus session_id/handle_id는 그대로 쓰면 이 서버의 핸들을 조작할 수 있으므로 노출하지 않음
+        return {
+            "in_flight": self.in_flight,
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+class JanusNode:
+    """Janus 서버 하나에 대한 transport와 videoroom 핸들 풀
+
+    핸들은 JANUS_HANDLES_PER_SESSION 개씩 여러 세션에 나눠 attach 하고,
+    요청은 처리 중인 요청이 가장 적은 핸들로 보낸다. 깨진 핸들/세션은 풀에서 빼고
+    백그라운드 복구 작업(지수 backoff + jitter)이 다시 채우므로 나머지 핸들은 계속 사용된다.
+    JANUS_STANDBY_SESSION이 켜져 있으면 미리 만들어 둔 예비 세션을 바로 풀에 넣어 장애를 넘긴다.
+    """
+
+    def __init__(self, url: str, ws_url: str | None = None):
+        self.name = url
+        self.handles: list[_Handle] = []
+        self.standby: list[_Handle] = []
+        self.keepalive_task: asyncio.Task | None = None
+        self._recovery_task: asyncio.Task | None = None
+        self._ready = asyncio.Event()
+        self.recovery_attempts = 0
+        self.failovers = 0
+        self.last_recovery_error: str | None = None
+        self._pool_size = max(1, settings.JANUS_HANDLE_POOL_SIZE)
+        self._handles_per_session = max(1, settings.JANUS_HANDLES_PER_SESSION)
+        self._next = 0
+        self.replaced_handles = 0
+        self.transport = build_transport(url, ws_url)
+        self.transport.on_disconnect = self._reset_session
+        self.breaker = CircuitBreaker(url)
+        self.latency = LatencyTracker()
+        self.retry_budget = RetryBudget()
+        # 마지막 list 결과 기준 부하 (least_loaded 배치에 사용)
+        self.rooms = 0
+        self.participants = 0
+
+    @property
+    def sessions(self) -> list[int]:
+        return list(dict.fromkeys(h.session_id for h in self.handles + self.standby))
+
+    def _set_handles(self, handles: list[_Handle]):
+        self.handles = handles
+        if handles:
+            self._ready.set()
+        else:
+            self._ready.clear()
+
+    def _reset_session(self):
+        """연결이 끊겨 모든 세션이 무효화된 경우 (WebSocket)"""
+        # 끊긴 연결에 걸려 있던 요청 수와 관계없이 연결 끊김 한 번을 실패 한 번으로 기록
+        self.breaker.record_failure()
+        self.standby = []
+        self._set_handles([])
+        self._ensure_recovery()
+
+    async def start(self):
+        await self.transport.start()
+
+    async def close(self):
+        for task in (self.keepalive_task, self._recovery_task):
+            if task:
+                task.cancel()
+        self.keepalive_task = None
+        self._recovery_task = None
+        await self.transport.close()
+        self.standby = []
+        self._set_handles([])
+
+    async def _send_request(self, payload: dict) -> dict:
+        """차단기 확인 -> 적응형 타임아웃으로 전송 -> 읽기 요청은 재시도 예산 안에서 jitter 후 재시도"""
+        operation = _operation(payload)
+        self.retry_budget.deposit()
+        attempt = 0
+        while True:
+            self.breaker.before_request()
+            started = time.monotonic()
+            try:
+                response = await self.transport.send(payload, timeout=self.latency.timeout_for(operation))
+            except JanusError:
+                # Janus가 응답은 했으므로 서버는 정상
+                self.latency.observe(operation, time.monotonic() - started)
+                self.breaker.record_success()
+                raise
+            except Exception as e:
+                if not is_transport_failure(e):
+                    raise
+                if isinstance(e, JanusTimeout):
+                    self.latency.observe_timeout(operation)
+                if not isinstance(e, JanusConnectionLost):  # on_disconnect(_reset_session)에서 이미 기록
+                    self.breaker.record_failure()
+                if (
+                    operation in IDEMPOTENT_OPERATIONS
+                    and attempt < settings.JANUS_RETRY_MAX_ATTEMPTS
+                    and self.breaker.state == "closed"
+                    and self.retry_budget.try_spend()
+                ):
+                    attempt += 1
+                    await asyncio.sleep(RetryBudget.backoff(attempt))
+                    payload = {**payload, "transaction": _generate_transaction_id()}
+                    continue
+                raise
+            self.latency.observe(operation, time.monotonic() - started)
+            self.breaker.record_success()
+            return response
+
+    async def _create_session(self) -> int:
+        session_payload = {"janus": "create", "transaction": _generate_transaction_id()}
+        session_response = await self._send_request(session_payload)
+        session_id = session_response["data"]["id"]
+        print(f"✅ Janus Session Created: {session_id} ({self.name})")
+        return session_id
+
+    async def _attach(self, session_id: int) -> _Handle:
+        attach_payload = {"janus": "attach", "session_id": session_id, "plugin": "janus.plugin.videoroom", "transaction": _generate_transaction_id()}
+        attach_response = await self._send_request(attach_payload)
+        handle = _Handle(session_id, attach_response["data"]["id"])
+        print(f"✅ Janus Handle Attached: {handle.handle_id} ({self.name})")
+        return handle
+
+    async def _fill(self):
+        """풀이 JANUS_HANDLE_POOL_SIZE가 될 때까지 핸들 추가 (자리가 남은 세션을 먼저 사용)"""
+        while len(self.handles) < self._pool_size:
+            per_session = {}
+            for h in self.handles:
+                per_session[h.session_id] = per_session.get(h.session_id, 0) + 1
+            session_id = next((sid for sid, n in per_session.items() if n < self._handles_per_session), None)
+            if session_id is None:
+                session_id = await self._create_session()
+                count = min(self._handles_per_session, self._pool_size - len(self.handles))
+            else:
+                count = self._handles_per_session - per_session[session_id]
+            handles, error = await self._attach_many(session_id, count)
+            # 일부 attach가 실패해도 붙은 핸들은 풀에 넣음 (버리면 Janus 쪽에 핸들이 남음, 남은 자리는 다음 시도에서 채움)
+            self._set_handles(self.handles + handles)
+            if error is not None:
+                raise error
+
+    async def _attach_many(self, session_id: int, count: int) -> tuple[list[_Handle], BaseException | None]:
+        """핸들 count개를 동시에 attach -> (성공한 핸들, 첫 실패)"""
+        results = await asyncio.gather(*(self._attach(session_id) for _ in range(count)), return_exceptions=True)
+        handles = [r for r in results if isinstance(r, _Handle)]
+        error = next((r for r in results if isinstance(r, BaseException)), None)
+        return handles, error
+
+    async def _destroy_session(self, session_id: int):
+        """세션을 없애 붙어 있는 핸들까지 Janus에서 정리 (실패해도 세션 타임아웃으로 정리되므로 로그만)"""
+        try:
+            await self._send_request({"janus": "destroy", "session_id": session_id, "transaction": _generate_transaction_id()})
+        except Exception as e:
+            print(f"⚠️ Failed to destroy Janus session {session_id} ({self.name}): {getattr(e, 'detail', e)}")
+
+    async def _fill_standby(self):
+        """장애 시 바로 교체할 예비 세션을 미리 생성"""
+        if not settings.JANUS_STANDBY_SESSION or self.standby:
+            return
+        session_id = await self._create_session()
+        handles, error = await self._attach_many(session_id, self._handles_per_session)
+        if error is not None:
+            # 일부만 붙은 예비 세션은 쓰지 않으므로 붙은 핸들과 함께 정리
+            await self._destroy_session(session_id)
+            raise error
+        self.standby = handles
+        print(f"🟡 Janus standby session ready: {session_id} ({self.name})")
+
+    def _ensure_recovery(self):
+        if self._recovery_task is None or self._recovery_task.done():
+            self._recovery_task = asyncio.create_task(self._recover())
+
+    async def _recover(self):
+        """풀(과 예비 세션)이 다 찰 때까지 지수 backoff + jitter로 재시도. 요청 경로는 막지 않음"""
+        attempt = 0
+        while True:
+            try:
+                before = len(self.handles)
+                await self._fill()
+                self.replaced_handles += max(0, len(self.handles) - before)
+                await self._fill_standby()
+                self.last_recovery_error = None
+                break
+            except CircuitOpenError:
+                # 차단기가 닫히기를 기다리는 것은 실패한 시도가 아니므로 backoff를 늘리지 않고 시험 가능 시점까지 대기
+                await asyncio.sleep(max(settings.JANUS_RECOVERY_BASE_DELAY, self.breaker.reset_in()))
+            except Exception as e:
+                attempt += 1
+                self.recovery_attempts += 1
+                self.last_recovery_error = str(getattr(e, "detail", e))
+                delay = random.uniform(0, min(settings.JANUS_RECOVERY_MAX_DELAY, settings.JANUS_RECOVERY_BASE_DELAY * (2 ** attempt)))
+                print(f"❌ Janus session recovery failed ({self.name}), retry in {delay:.2f}s: {self.last_recovery_error}")
+                await asyncio.sleep(delay)
+        # Keep-Alive Task (Optional but recommended)
+        if not self.keepalive_task or self.keepalive_task.done():
+            self.keepalive_task = asyncio.create_task(self._keepalive())
+
+    async def warm_up(self):
+        """핸들 풀을 미리 생성 (lifespan 등에서 호출, 실패해도 백그라운드 복구가 계속 시도)"""
+        self._ensure_recovery()
+        await self._wait_ready(settings.JANUS_RECOVERY_WAIT)
+
+    def _discard(self, broken: list[_Handle]):
+        """깨진 핸들을 풀에서 제거하고, 예비 세션이 있으면 바로 교체한 뒤 백그라운드에서 보충"""
+        if any(h in self.standby for h in broken):
+            self.standby = []
+        handles = [h for h in self.handles if h not in broken]
+        if len(handles) < len(self.handles) and self.standby:
+            handles += self.standby
+            self.standby = []
+            self.failovers += 1
+            print(f"🔀 Janus failover to standby session ({self.name})")
+        self._set_handles(handles)
+        self._ensure_recovery()
+
+    async def _keepalive(self):
+        """세션이 타임아웃되지 않도록 주기적으로 keepalive 메시지를 보냄"""
+        while True:
+            await asyncio.sleep(30)  # Janus의 세션 타임아웃(기본값 60초)보다 짧게 설정
+            sessions = self.sessions
+            results = await asyncio.gather(*(
+                self._send_request({"janus": "keepalive", "session_id": session_id, "transaction": _generate_transaction_id()})
+                for session_id in sessions
+            ), return_exceptions=True)
+            for session_id, result in zip(sessions, results):
+                if isinstance(result, CircuitOpenError):
+                    # 서버 장애 중에는 세션을 버리지 않고 차단기가 닫힐 때까지 유지
+                    continue
+                if isinstance(result, Exception):
+                    print(f"❌ Failed to send keepalive for session {session_id}, replacing its handles: {result}")
+                    self._discard([h for h in self.handles + self.standby if h.session_id == session_id])
+            print(f"🔄 Janus session keepalive sent for {len(sessions)} session(s) ({self.name})")
+
+    async def _wait_ready(self, deadline: float):
+        if self.handles:
+            return
+        self._ensure_recovery()
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=deadline)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Janus session unavailable: {self.last_recovery_error or 'recovering'}",
+            )
+
+    async def _acquire(self) -> _Handle:
+        """처리 중인 요청이 가장 적은 핸들 선택 (동률이면 순환). 풀이 비어 있으면 복구를 최대 JANUS_RECOVERY_WAIT 동안 대기"""
+        if not self.handles:
+            await self._wait_ready(settings.JANUS_RECOVERY_WAIT)
+        handles = self.handles
+        if not handles:
+            # 준비 신호 이후 다시 연결이 끊겨 풀이 비어 버린 경우
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Janus session unavailable: {self.last_recovery_error or 'recovering'}",
+            )
+        self._next = (self._next + 1) % len(handles)
+        return min(handles[self._next:] + handles[:self._next], key=lambda h: h.in_flight)
+
+    async def message(self, body: dict) -> dict:
+        """videoroom 플러그인 요청을 보내고 plugindata.data를 반환"""
+        for attempt in range(2):
+            handle = await self._acquire()
+            payload = {
+                "janus": "message", "session_id": handle.session_id, "handle_id": handle.handle_id, "transaction": _generate_transaction_id(),
+                "body": body
+            }
+            handle.in_flight += 1
+            handle.requests += 1
+            try:
+                response = await self._send_request(payload)
+                return response.get("plugindata", {}).get("data", {})
+            except JanusError as e:
+                handle.errors += 1
+                if e.code == JANUS_ERROR_SESSION_NOT_FOUND:
+                    self._discard([h for h in self.handles if h.session_id == handle.session_id])
+                elif e.code == JANUS_ERROR_HANDLE_NOT_FOUND:
+                    self._discard([handle])
+                else:
+                    raise
+                # 세션/핸들이 없어서 실행되지 않은 요청이므로 다른 핸들로 한번 더 시도
+                if attempt:
+                    raise
+            except Exception:
+                handle.errors += 1
+                raise
+            finally:
+                handle.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "pool_size": self._pool_size,
+            "sessions": len(self.sessions),
+            "replaced_handles": self.replaced_handles,
+            "handles": [h.stats() for h in self.handles],
+            "standby_session": bool(self.standby),
+            "recovering": bool(self._recovery_task and not self._recovery_task.done()),
+            "recovery_attempts": self.recovery_attempts,
+            "failovers": self.failovers,
+            "last_recovery_error": self.last_recovery_error,
+            "rooms": self.rooms,
+            "participants": self.participants,
+            "breaker": self.breaker.stats(),
+            "latency": self.latency.stats(),
+            "retry_budget": self.retry_budget.stats(),
+            "transport": self.transport.stats(),
+        }
+
+
+class JanusCluster:
+    """여러 Janus 노드에 방을 배치하고 room id로 담당 노드를 찾음"""
+
+    def __init__(self, urls: list[tuple[str, str | None]]):
+        if settings.JANUS_ROOM_PLACEMENT not in ("hash", "least_loaded"):
+            raise ValueError("JANUS_ROOM_PLACEMENT는 hash 또는 least_loaded 이어야 합니다.")
+        self.nodes = {url: JanusNode(url, ws_url) for url, ws_url in urls}
+        self.ring = HashRing(list(self.nodes))
+        # list 응답/방 생성으로 확인된 실제 담당 노드 (노드 추가 이전에 만들어진 방 대응)
+        self._room_owner: dict[int, str] = {}
+
+    @property
+    def is_single(self) -> bool:
+        return len(self.nodes) == 1
+
+    def node_for_room(self, room_id: int) -> JanusNode:
+        owner = self._room_owner.get(room_id)
+        if owner in self.nodes:
+            return self.nodes[owner]
+        return self.nodes[self.ring.lookup(room_id)]
+
+    def remember_room(self, room_id: int, node: JanusNode):
+        if not self.is_single:
+            self._room_owner[room_id] = node.name
+
+    def forget_room(self, room_id: int):
+        self._room_owner.pop(room_id, None)
+
+    def _least_loaded(self) -> JanusNode:
+        return min(self.nodes.values(), key=lambda n: (n.participants, n.rooms))
+
+    def place_new_room(self) -> tuple[JanusNode, int | None]:
+        """새 방을 둘 노드와 room id를 결정 (단일 노드면 room id는 Janus가 정함)"""
+        if self.is_single:
+            return next(iter(self.nodes.values())), None
+        if settings.JANUS_ROOM_PLACEMENT == "least_loaded":
+            target = self._least_loaded()
+            # room id만으로 담당 노드를 찾을 수 있도록 링에서 target에 매핑되는 id를 고름
+            while True:
+                room_id = random.randint(1, _MAX_ROOM_ID)
+                if self.ring.lookup(room_id) == target.name:
+                    return target, room_id
+        room_id = random.randint(1, _MAX_ROOM_ID)
+        return self.node_for_room(room_id), room_id
+
+    async def start(self):
+        await asyncio.gather(*(node.start() for node in self.nodes.values()))
+
+    async def warm_up(self) -> list[str]:
+        """모든 노드의 세션/핸들을 동시에 미리 생성하고, 준비되지 못한 노드 이름 목록 반환"""
+        results = await asyncio.gather(*(node.warm_up() for node in self.nodes.values()), return_exceptions=True)
+        return [node.name for node, result in zip(self.nodes.values(), results) if isinstance(result, BaseException)]
+
+    async def close(self):
+        await asyncio.gather(*(node.close() for node in self.nodes.values()))
+
+    async def fan_out(self, body: dict) -> list[tuple[JanusNode, dict | Exception]]:
+        """모든 노드에 같은 요청을 동시에 보내고 노드별 결과(또는 예외)를 반환"""
+        nodes = list(self.nodes.values())
+        results = await asyncio.gather(*(node.message(body) for node in nodes), return_exceptions=True)
+        return list(zip(nodes, results))
+
+    def stats(self) -> dict:
+        return {
+            "placement": settings.JANUS_ROOM_PLACEMENT,
+            "nodes": {name: node.stats() for name, node in self.nodes.items()},
+        }
+
@@ -0,0 +1,169 @@
+# app/services/janus_resilience.py
+
+import time
+import random
+from collections import deque
+
+from fastapi import HTTPException, status
+from app.core.config import get_settings
+from app.services.janus_transport import JanusError, _timeout_seconds
+
+settings = get_settings()
+
+_LATENCY_WINDOW = 256       # 요청 종류별로 보관하는 최근 응답 시간 개수
+_MIN_SAMPLES = 20           # 이보다 적으면 설정의 고정 타임아웃 사용
+_RETRY_BUDGET_MAX = 10.0    # 모아 둘 수 있는 재시도 토큰 최대치
+
+# 재시도해도 Janus 상태가 바뀌지 않는 읽기 요청
+IDEMPOTENT_OPERATIONS = {"list", "listparticipants", "exists"}
+
+
+class CircuitOpenError(HTTPException):
+    """차단기가 열려 있어 Janus에 요청하지 않고 바로 실패"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Janus server temporarily unavailable (circuit open: {name})",
+            headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+        )
+
+
+def is_transport_failure(exc: BaseException) -> bool:
+    """차단기/재시도 대상 실패인지 (Janus가 정상적으로 error 응답을 준 경우는 제외)"""
+    if isinstance(exc, (JanusError, CircuitOpenError)):
+        return False
+    return isinstance(exc, HTTPException) and exc.status_code >= 500
+
+
+class CircuitBreaker:
+    """연속 실패가 threshold에 도달하면 reset_timeout 동안 열림 -> 이후 요청 하나로 시험(half_open)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.open_count = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+        self._probe_started = 0.0
+
+    def before_request(self):
+        if self.state == "closed":
+            return
+        elapsed = time.monotonic() - self.opened_at
+        if self.state == "open" and elapsed >= settings.JANUS_BREAKER_RESET_TIMEOUT:
+            self.state = "half_open"
+        if self.state == "half_open":
+            now = time.monotonic()
+            # 시험 요청이 취소되어 결과가 기록되지 않은 경우에도 다시 시험할 수 있도록
+            if not self._probe_in_flight or now - self._probe_started >= settings.JANUS_BREAKER_RESET_TIMEOUT:
+                self._probe_in_flight = True
+                self._probe_started = now
+                return
+        self.rejected += 1
+        raise CircuitOpenError(self.name, settings.JANUS_BREAKER_RESET_TIMEOUT - elapsed)
+
+    def reset_in(self) -> float:
+        """열린 상태에서 시험 요청이 가능해질 때까지 남은 시간(초)"""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, settings.JANUS_BREAKER_RESET_TIMEOUT - (time.monotonic() - self.opened_at))
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+        self.state = "closed"
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= settings.JANUS_BREAKER_FAILURE_THRESHOLD:
+            if self.state != "open":
+                self.open_count += 1
+                print(f"⛔ Janus circuit opened: {self.name}")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_count": self.open_count,
+            "rejected": self.rejected,
+        }
+
+
+class LatencyTracker:
+    """요청 종류별 최근 응답 시간으로 백분위와 적응형 타임아웃 계산"""
+
+    def __init__(self):
+        self._samples: dict[str, deque] = {}
+
+    def observe(self, operation: str, seconds: float):
+        self._samples.setdefault(operation, deque(maxlen=_LATENCY_WINDOW)).append(seconds)
+
+    def observe_timeout(self, operation: str):
+        """타임아웃난 요청은 고정 타임아웃(상한)을 표본으로 기록
+
+        성공한 응답만 기록하면 창에 빠른 표본만 남아 Janus가 느려졌을 때 타임아웃이 다시 늘어나지 않으므로,
+        타임아웃이 반복되면 p99가 상한까지 올라가 고정 타임아웃으로 돌아가게 한다.
+        """
+        self.observe(operation, _timeout_seconds(operation))
+
+    def percentile(self, operation: str, q: float) -> float | None:
+        samples = self._samples.get(operation)
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def timeout_for(self, operation: str) -> float:
+        """p99 * 배수 (설정된 고정 타임아웃을 상한, JANUS_TIMEOUT_MIN을 하한으로)"""
+        ceiling = _timeout_seconds(operation)
+        samples = self._samples.get(operation)
+        if not settings.JANUS_ADAPTIVE_TIMEOUT or not samples or len(samples) < _MIN_SAMPLES:
+            return ceiling
+        p99 = self.percentile(operation, 0.99)
+        return min(ceiling, max(settings.JANUS_TIMEOUT_MIN, p99 * settings.JANUS_TIMEOUT_MULTIPLIER))
+
+    def stats(self) -> dict:
+        return {
+            operation: {
+                "samples": len(samples),
+                "p50_ms": round(self.percentile(operation, 0.50) * 1000, 2),
+                "p95_ms": round(self.percentile(operation, 0.95) * 1000, 2),
+                "p99_ms": round(self.percentile(operation, 0.99) * 1000, 2),
+                "timeout_ms": round(self.timeout_for(operation) * 1000, 2),
+            }
+            for operation, samples in self._samples.items()
+        }
+
+
+class RetryBudget:
+    """요청마다 JANUS_RETRY_BUDGET_RATIO 만큼 토큰을 적립하고 재시도 시 1개 사용 (재시도 폭주 방지)"""
+
+    def __init__(self):
+        self.tokens = _RETRY_BUDGET_MAX
+        self.retries = 0
+        self.exhausted = 0
+
+    def deposit(self):
+        self.tokens = min(_RETRY_BUDGET_MAX, self.tokens + settings.JANUS_RETRY_BUDGET_RATIO)
+
+    def try_spend(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            self.retries += 1
+            return True
+        self.exhausted += 1
+        return False
+
+    @staticmethod
+    def backoff(attempt: int) -> float:
+        """full jitter: 0 ~ base * 2^attempt"""
+        return random.uniform(0, settings.JANUS_RETRY_BASE_DELAY * (2 ** attempt))
+
+    def stats(self) -> dict:
+        return {"tokens": round(self.tokens, 2), "retries": self.retries, "exhausted": self.exhausted}
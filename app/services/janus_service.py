@@ -1,148 +1,223 @@
 # app/services/janus_service.py
 
-import httpx
-import random
-import string
+import time
 import asyncio
+from typing import Any, Awaitable, Callable
+
 from fastapi import HTTPException, status
 from app.core.config import get_settings
 from app.schemas.janus import RoomUpdateRequest
+from app.services.janus_cache import JanusCache, SingleFlight
+from app.services.janus_cluster import JanusCluster, janus_node_urls
+from app.services.janus_state import RoomMirror
+from app.services.janus_watch import RoomWatchHub
 
 settings = get_settings()
 
-# ( _generate_transaction_id 함수는 그대로 사용 )
-def _generate_transaction_id(length: int = 12) -> str:
-    return "".join(random.choice(string.ascii_letters + string.digits) for _ in range(length))
+
+# 캐시 키: 방 목록 / 방별 참여자 목록
+_ROOM_LIST_KEY = ("list",)
+
+
+def _participants_key(room_id: int) -> tuple:
+    return ("listparticipants", room_id)
 
 
 class JanusService:
     def __init__(self):
-        self.session_id: int | None = None
-        self.handle_id: int | None = None
-        self.keepalive_task: asyncio.Task | None = None
-        self._lock = asyncio.Lock()
-
-    async def _send_request(self, payload: dict) -> dict:
-        # ( 기존 _send_request 함수는 그대로 사용 )
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(settings.JANUS_SERVER_URL, json=payload, timeout=5.0)
-                response.raise_for_status()
-                janus_response = response.json()
-                if janus_response.get("janus") == "error":
-                    error = janus_response.get("error", {})
-                    raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Janus API Error: {error.get('code')} {error.get('reason')}")
-                return janus_response
-            except httpx.HTTPStatusError as e:
-                raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Failed to communicate with Janus server: {e.response.text}")
-            except httpx.RequestError as e:
-                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not connect to Janus server: {e}")
-
-    async def _initialize_session(self):
-        """세션과 비디오룸 핸들을 한번만 생성하고, self에 저장"""
-        async with self._lock:
-            if self.session_id and self.handle_id:
-                # 이미 초기화된 경우, 바로 리턴
-                return
-
-            # 1. Create Session
-            session_payload = {"janus": "create", "transaction": _generate_transaction_id()}
-            session_response = await self._send_request(session_payload)
-            self.session_id = session_response["data"]["id"]
-            print(f"✅ Janus Session Created: {self.session_id}")
-
-            # 2. Attach Plugin
-            attach_payload = {"janus": "attach", "session_id": self.session_id, "plugin": "janus.plugin.videoroom", "transaction": _generate_transaction_id()}
-            attach_response = await self._send_request(attach_payload)
-            self.handle_id = attach_response["data"]["id"]
-            print(f"✅ Janus Handle Attached: {self.handle_id}")
-
-            # 3. Start Keep-Alive Task (Optional but recommended)
-            if self.keepalive_task:
-                self.keepalive_task.cancel()
-            self.keepalive_task = asyncio.create_task(self._keepalive())
-
-    async def _keepalive(self):
-        """세션이 타임아웃되지 않도록 주기적으로 keepalive 메시지를 보냄"""
+        self.cluster = JanusCluster(janus_node_urls())
+        self.cache = JanusCache(
+            ttl=settings.JANUS_CACHE_TTL,
+            stale_ttl=settings.JANUS_CACHE_STALE_TTL,
+            max_entries=settings.JANUS_CACHE_MAX_ENTRIES,
+        )
+        self.single_flight = SingleFlight()
+        # 이벤트로 갱신되는 방/참여자 상태 사본 (JANUS_STATE_MIRROR=true 일 때만)
+        self.mirror = RoomMirror() if settings.JANUS_STATE_MIRROR else None
+        self._resync_task: asyncio.Task | None = None
+        # 참여자 변화 스트림용 방별 watcher
+        self.watchers = RoomWatchHub(self)
+        if self.mirror:
+            self.mirror.on_change = self.watchers.notify
+            for node in self.cluster.nodes.values():
+                node.transport.on_event = self.handle_event
+
+    # --- transport 수명 주기 (app lifespan에서 호출) ---
+    async def start(self):
+        await self.cluster.start()
+        if self.mirror and self._resync_task is None:
+            self._resync_task = asyncio.create_task(self._resync_loop())
+
+    async def warm_up(self):
+        """시작 시 Janus 세션과 videoroom 핸들을 미리 생성 (실패한 노드는 백그라운드 복구가 계속 시도)"""
+        failed = await self.cluster.warm_up()
+        if failed:
+            print(f"⚠️ Janus warm-up incomplete, recovering in background: {failed}")
+
+    async def close(self):
+        """노드별 keepalive 작업을 멈추고 transport(커넥션 풀/WebSocket)를 닫음"""
+        if self._resync_task:
+            self._resync_task.cancel()
+            self._resync_task = None
+        self.watchers.close()
+        await self.cluster.close()
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        return {
+            "cluster": self.cluster.stats(),
+            "cache": self.cache.stats(),
+            "coalescing": self.single_flight.stats(),
+            "mirror": self.mirror.stats() if self.mirror else None,
+            "watchers": self.watchers.stats(),
+        }
+
+    # --- 방/참여자 상태 사본 ---
+    def handle_event(self, event: dict) -> bool:
+        """Janus 이벤트(event handler 웹훅, WebSocket 비동기 이벤트)를 상태 사본에 반영"""
+        if not self.mirror:
+            return False
+        return self.mirror.handle_event(event)
+
+    def _mirror_ready(self) -> bool:
+        return self.mirror is not None and self.mirror.ready
+
+    async def resync(self):
+        """모든 노드의 방 목록과 참여자를 다시 읽어 상태 사본을 교체 (이벤트 누락 보정)"""
+        started_at = time.monotonic()
+        self.mirror.begin_resync()
+        try:
+            rooms: dict[int, dict] = {}
+            for node, result in await self.cluster.fan_out({"request": "list"}):
+                if isinstance(result, Exception):
+                    # 일부 노드만 읽고 교체하면 그 노드의 방이 사라지므로 이번 재동기화는 포기
+                    raise result
+                for room in result.get("list", []):
+                    self.cluster.remember_room(room["room"], node)
+                    rooms[room["room"]] = {"description": room.get("description", ""), "participants": {}}
+            room_ids = list(rooms)
+            results = await self.run_batch([
+                lambda room_id=room_id: self._fetch_room_participants(room_id) for room_id in room_ids
+            ])
+            for room_id, participants in zip(room_ids, results):
+                if isinstance(participants, Exception):
+                    raise participants
+                rooms[room_id]["participants"] = {p["id"]: p.get("display", "") for p in participants}
+        except BaseException:
+            self.mirror.abort_resync()
+            raise
+        self.mirror.replace(rooms, started_at)
+
+    async def _resync_loop(self):
         while True:
-            await asyncio.sleep(30)  # Janus의 세션 타임아웃(기본값 60초)보다 짧게 설정
             try:
-                payload = {"janus": "keepalive", "session_id": self.session_id, "transaction": _generate_transaction_id()}
-                await self._send_request(payload)
-                print(f"🔄 Janus session keepalive sent for session {self.session_id}")
+                await self.resync()
             except Exception as e:
-                print(f"❌ Failed to send keepalive, attempting to reconnect: {e}")
-                self.session_id = None # 세션 초기화
-                self.handle_id = None
-                await self._initialize_session() # 재연결 시도
+                print(f"❌ Janus state resync failed: {e}")
+            await asyncio.sleep(settings.JANUS_STATE_RESYNC_INTERVAL)
 
-    async def _get_session_and_handle(self) -> (int, int):
-        """초기화되지 않았으면 초기화를 실행하고, 저장된 세션/핸들 ID를 반환"""
-        if not self.session_id or not self.handle_id:
-            await self._initialize_session()
-        return self.session_id, self.handle_id
+    def _invalidate(self, *keys):
+        """쓰기 요청 후 캐시와 진행 중인 공유 조회를 함께 무효화"""
+        self.cache.invalidate(*keys)
+        self.single_flight.forget(*keys)
 
     # CREATE
     async def create_videoroom(self, description: str, secret: str | None = None) -> dict:
-        session_id, handle_id = await self._get_session_and_handle()
-        create_room_payload = {
-            "janus": "message", "session_id": session_id, "handle_id": handle_id, "transaction": _generate_transaction_id(),
-            "body": {"request": "create", "description": description, "secret": secret, "is_private": bool(secret), "permanent": True}
-        }
-        room_response = await self._send_request(create_room_payload)
-        plugindata = room_response.get("plugindata", {}).get("data", {})
+        node, room_id = self.cluster.place_new_room()
+        body = {"request": "create", "description": description, "secret": secret, "is_private": bool(secret), "permanent": True}
+        if room_id is not None:
+            body["room"] = room_id
+        try:
+            plugindata = await node.message(body)
+        finally:
+            self._invalidate(_ROOM_LIST_KEY)
         if plugindata.get("videoroom") == "created":
+            node.rooms += 1
+            self.cluster.remember_room(plugindata["room"], node)
+            if self.mirror:
+                self.mirror.set_room(plugindata["room"], description)
             return {"room": plugindata["room"], "description": description, "is_private": bool(secret),"permanent": plugindata.get("permanent", True), "num_participants": 0}
         else:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to create room in Janus.")
 
     # READ (List)
     async def get_room_list(self) -> list:
-        session_id, handle_id = await self._get_session_and_handle()
-        list_rooms_payload = {
-            "janus": "message", "session_id": session_id, "handle_id": handle_id, "transaction": _generate_transaction_id(),
-            "body": {"request": "list"}
-        }
-        response = await self._send_request(list_rooms_payload)
-        return response.get("plugindata", {}).get("data", {}).get("list", [])
+        if self._mirror_ready():
+            return self.mirror.room_list()
+        return await self.cache.get_or_load(
+            _ROOM_LIST_KEY, lambda: self.single_flight.do(_ROOM_LIST_KEY, self._fetch_room_list)
+        )
+
+    async def _fetch_room_list(self) -> list:
+        """모든 노드에 동시에 list를 보내고 결과를 합침 (일부 노드 실패 시 나머지 결과만 반환)"""
+        rooms, errors = [], []
+        for node, result in await self.cluster.fan_out({"request": "list"}):
+            if isinstance(result, Exception):
+                print(f"❌ Janus room list failed on {node.name}: {result}")
+                errors.append(result)
+                continue
+            node_rooms = result.get("list", [])
+            node.rooms = len(node_rooms)
+            node.participants = sum(room.get("num_participants", 0) for room in node_rooms)
+            for room in node_rooms:
+                self.cluster.remember_room(room["room"], node)
+            rooms.extend(node_rooms)
+        if errors and len(errors) == len(self.cluster.nodes):
+            raise errors[0]
+        return rooms
 
     # READ (Participants)
     async def get_room_participants(self, room_id: int) -> list:
-        session_id, handle_id = await self._get_session_and_handle()
-        list_participants_payload = {
-            "janus": "message", "session_id": session_id, "handle_id": handle_id, "transaction": _generate_transaction_id(),
-            "body": {"request": "listparticipants", "room": room_id}
-        }
-        response = await self._send_request(list_participants_payload)
-        return response.get("plugindata", {}).get("data", {}).get("participants", [])
+        if self._mirror_ready() and self.mirror.has_room(room_id):
+            return self.mirror.participants(room_id)
+        key = _participants_key(room_id)
+        return await self.cache.get_or_load(
+            key, lambda: self.single_flight.do(key, lambda: self._fetch_room_participants(room_id))
+        )
+
+    async def _fetch_room_participants(self, room_id: int) -> list:
+        plugindata = await self.cluster.node_for_room(room_id).message({"request": "listparticipants", "room": room_id})
+        return plugindata.get("participants", [])
 
     # UPDATE
     async def edit_videoroom(self, room_id: int, update_data: RoomUpdateRequest) -> dict:
-        session_id, handle_id = await self._get_session_and_handle()
         body = {"request": "edit", "room": room_id}
         body.update(update_data.model_dump(exclude_unset=True)) # 입력된 필드만 추가
-        
-        edit_room_payload = {
-            "janus": "message", "session_id": session_id, "handle_id": handle_id, "transaction": _generate_transaction_id(),
-            "body": body
-        }
-        response = await self._send_request(edit_room_payload)
-        plugindata = response.get("plugindata", {}).get("data", {})
+        try:
+            plugindata = await self.cluster.node_for_room(room_id).message(body)
+        finally:
+            self._invalidate(_ROOM_LIST_KEY)
         if plugindata.get("videoroom") == "edited":
+             if self.mirror and update_data.new_description is not None:
+                 self.mirror.set_room(room_id, update_data.new_description)
              return {"room": plugindata["room"]}
         raise HTTPException(status_code=500, detail="Failed to edit room")
 
     # DELETE
     async def destroy_videoroom(self, room_id: int, secret: str | None = None):
-        session_id, handle_id = await self._get_session_and_handle()
-        destroy_room_payload = {
-            "janus": "message", "session_id": session_id, "handle_id": handle_id, "transaction": _generate_transaction_id(),
-            "body": {"request": "destroy", "room": room_id, "secret": secret}
-        }
-        response = await self._send_request(destroy_room_payload)
-        if response.get("plugindata", {}).get("data", {}).get("videoroom") == "destroyed":
+        node = self.cluster.node_for_room(room_id)
+        try:
+            plugindata = await node.message({"request": "destroy", "room": room_id, "secret": secret})
+        finally:
+            self._invalidate(_ROOM_LIST_KEY, _participants_key(room_id))
+        if plugindata.get("videoroom") == "destroyed":
+            node.rooms = max(node.rooms - 1, 0)
+            self.cluster.forget_room(room_id)
+            if self.mirror:
+                self.mirror.remove_room(room_id)
             return
         raise HTTPException(status_code=500, detail="Failed to destroy room")
 
+    # BATCH
+    async def run_batch(self, calls: list[Callable[[], Awaitable[Any]]]) -> list[Any | Exception]:
+        """여러 요청을 JANUS_BATCH_CONCURRENCY 만큼만 동시에 실행하고, 순서대로 결과(또는 예외)를 반환"""
+        semaphore = asyncio.Semaphore(max(1, settings.JANUS_BATCH_CONCURRENCY))
+
+        async def run(call):
+            async with semaphore:
+                return await call()
+
+        return await asyncio.gather(*(run(call) for call in calls), return_exceptions=True)
+
 
-janus_service = JanusService()
\ No newline at end of file
+janus_service = JanusService()
@@ -0,0 +1,151 @@
+# app/services/janus_state.py
+
+import time
+from typing import Callable
+
+
+def _videoroom_event(event: dict) -> dict | None:
+    """Janus 이벤트(event handler 웹훅 / WebSocket 비동기 메시지)를 videoroom 이벤트 데이터로 정규화"""
+    # 1) event handler (janus.eventhandler.sampleevh 등) type 64 = plugin 이벤트
+    if event.get("type") == 64:
+        body = event.get("event", {})
+        if body.get("plugin") != "janus.plugin.videoroom":
+            return None
+        return body.get("data")
+    # 2) WebSocket/long-poll 세션 이벤트
+    if event.get("janus") == "event":
+        data = event.get("plugindata", {}).get("data", {})
+        if event.get("plugindata", {}).get("plugin") not in (None, "janus.plugin.videoroom"):
+            return None
+        if data.get("videoroom") == "destroyed":
+            return {"event": "destroyed", "room": data.get("room")}
+        if "leaving" in data or "kicked" in data:
+            pid = data.get("leaving") or data.get("kicked")
+            return {"event": "leaving", "room": data.get("room"), "id": pid} if isinstance(pid, int) else None
+        if data.get("joining"):
+            joining = data["joining"]
+            return {"event": "joined", "room": data.get("room"), "id": joining.get("id"), "display": joining.get("display")}
+        if data.get("publishers"):
+            # 게시자 목록 알림은 여러 명이 한번에 올 수 있으므로 목록 그대로 전달
+            return {"event": "publishers", "room": data.get("room"), "publishers": data["publishers"]}
+    return None
+
+
+class RoomMirror:
+    """Janus 방/참여자 상태의 인메모리 사본
+
+    이벤트로 증분 갱신하고, 주기적인 전체 재동기화(replace)로 누락된 이벤트를 보정한다.
+    재동기화 도중 들어온 이벤트는 모아 두었다가 새 스냅샷 위에 다시 적용한다.
+    """
+
+    def __init__(self):
+        # room_id -> {"description": str, "participants": {participant_id: display}}
+        self._rooms: dict[int, dict] = {}
+        self.ready = False
+        self._resyncing = False
+        self._buffered: list[dict] = []
+        # 방 상태가 바뀌면 호출 (room_id, 전체 재동기화 후에는 None)
+        self.on_change: Callable[[int | None], None] | None = None
+        self.events_applied = 0
+        self.events_ignored = 0
+        self.resyncs = 0
+        self.last_resync_at: float | None = None
+        self.last_resync_seconds: float | None = None
+
+    # --- 조회 ---
+    def has_room(self, room_id: int) -> bool:
+        return room_id in self._rooms
+
+    def room_list(self) -> list:
+        return [
+            {"room": room_id, "description": room["description"], "num_participants": len(room["participants"])}
+            for room_id, room in self._rooms.items()
+        ]
+
+    def participants(self, room_id: int) -> list:
+        room = self._rooms.get(room_id)
+        if room is None:
+            return []
+        return [{"id": pid, "display": display} for pid, display in room["participants"].items()]
+
+    # --- 갱신 ---
+    def begin_resync(self):
+        self._resyncing = True
+        self._buffered = []
+
+    def abort_resync(self):
+        self._resyncing = False
+        self._buffered = []
+
+    def replace(self, rooms: dict[int, dict], started_at: float):
+        """전체 스냅샷으로 교체 후 재동기화 중 버퍼링된 이벤트를 재적용"""
+        self._rooms = rooms
+        buffered, self._buffered = self._buffered, []
+        self._resyncing = False
+        for event in buffered:
+            self._apply(event)
+        self.ready = True
+        self.resyncs += 1
+        self.last_resync_at = time.time()
+        self.last_resync_seconds = round(time.monotonic() - started_at, 4)
+        self._changed(None)
+
+    def _changed(self, room_id: int | None):
+        if self.on_change:
+            self.on_change(room_id)
+
+    def set_room(self, room_id: int, description: str):
+        room = self._rooms.setdefault(room_id, {"description": description, "participants": {}})
+        room["description"] = description
+
+    def remove_room(self, room_id: int):
+        self._rooms.pop(room_id, None)
+        self._changed(room_id)
+
+    def handle_event(self, event: dict) -> bool:
+        data = _videoroom_event(event)
+        if not data or data.get("room") is None:
+            self.events_ignored += 1
+            return False
+        if self._resyncing:
+            self._buffered.append(data)
+        self._apply(data)
+        return True
+
+    def _apply(self, data: dict):
+        kind = data.get("event")
+        room_id = data.get("room")
+        if kind == "created":
+            self._rooms.setdefault(room_id, {"description": data.get("description", ""), "participants": {}})
+        elif kind == "destroyed":
+            self._rooms.pop(room_id, None)
+        elif kind == "edited" and room_id in self._rooms and "description" in data:
+            self._rooms[room_id]["description"] = data["description"]
+        elif kind in ("joined", "configured", "published") and data.get("id") is not None:
+            room = self._rooms.setdefault(room_id, {"description": "", "participants": {}})
+            current = room["participants"].get(data["id"])
+            room["participants"][data["id"]] = data.get("display", current) or current or ""
+        elif kind == "publishers":
+            room = self._rooms.setdefault(room_id, {"description": "", "participants": {}})
+            for publisher in data.get("publishers", []):
+                room["participants"][publisher.get("id")] = publisher.get("display", "")
+        elif kind in ("leaving", "kicked") and room_id in self._rooms:
+            self._rooms[room_id]["participants"].pop(data.get("id"), None)
+        else:
+            self.events_ignored += 1
+            return
+        self.events_applied += 1
+        if not self._resyncing:
+            self._changed(room_id)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "rooms": len(self._rooms),
+            "participants": sum(len(r["participants"]) for r in self._rooms.values()),
+            "events_applied": self.events_applied,
+            "events_ignored": self.events_ignored,
+            "resyncs": self.resyncs,
+            "last_resync_at": self.last_resync_at,
+            "last_resync_seconds": self.last_resync_seconds,
+        }
@@ -0,0 +1,301 @@
+# app/services/janus_transport.py
+
+import json
+import asyncio
+from typing import Callable
+
+import httpx
+from fastapi import HTTPException, status
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+def _operation(payload: dict) -> str:
+    """payload에서 요청 종류를 추출 (message인 경우 플러그인 request 이름)"""
+    if payload.get("janus") == "message":
+        return payload.get("body", {}).get("request", "message")
+    return payload.get("janus", "unknown")
+
+
+_READ_OPERATIONS = {"list", "listparticipants", "exists"}
+
+
+def _timeout_seconds(operation: str) -> float:
+    """요청 종류별 응답 대기 시간(초)"""
+    if operation == "keepalive":
+        return settings.JANUS_KEEPALIVE_TIMEOUT
+    if operation in _READ_OPERATIONS:
+        return settings.JANUS_READ_TIMEOUT
+    return settings.JANUS_WRITE_TIMEOUT
+
+
+# Janus 에러 코드 (janus/apierror.h)
+JANUS_ERROR_SESSION_NOT_FOUND = 458
+JANUS_ERROR_HANDLE_NOT_FOUND = 459
+
+
+class JanusError(HTTPException):
+    """Janus가 {"janus": "error"}로 응답한 경우 (code로 세션/핸들 만료 등을 구분)"""
+
+    def __init__(self, code: int | None, reason: str | None):
+        super().__init__(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Janus API Error: {code} {reason}")
+        self.code = code
+
+
+class JanusConnectionLost(HTTPException):
+    """WebSocket 연결이 끊겨 대기 중이던 요청이 실패한 경우 (연결 하나당 한 번만 실패로 집계하도록 구분)"""
+
+    def __init__(self, detail: str = "Janus WebSocket connection lost"):
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
+
+
+class JanusTimeout(HTTPException):
+    """응답 대기 시간 초과 (연결은 되었지만 Janus 응답이 타임아웃보다 늦음)"""
+
+    def __init__(self):
+        super().__init__(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail="Janus request timed out")
+
+
+def _raise_for_janus_error(janus_response: dict) -> dict:
+    if janus_response.get("janus") == "error":
+        error = janus_response.get("error", {})
+        raise JanusError(error.get("code"), error.get("reason"))
+    return janus_response
+
+
+def _http2_enabled() -> bool:
+    if not settings.JANUS_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        print("⚠️ JANUS_HTTP2=true 이지만 h2 패키지가 없어 HTTP/1.1로 동작합니다 (pip install 'httpx[http2]')")
+        return False
+    return True
+
+
+class JanusHttpTransport:
+    """공유 httpx 클라이언트(커넥션 풀)로 Janus REST API에 요청"""
+
+    name = "http"
+
+    def __init__(self, url: str):
+        self.url = url
+        self.on_disconnect: Callable[[], None] | None = None
+        self.on_event: Callable[[dict], None] | None = None  # HTTP transport에서는 사용하지 않음
+        self._client: httpx.AsyncClient | None = None
+        self._http2 = False
+        self._in_flight = 0
+        self._requests_total = 0
+        self._errors_total = 0
+
+    def _build_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.JANUS_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.JANUS_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.JANUS_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(settings.JANUS_READ_TIMEOUT, connect=settings.JANUS_CONNECT_TIMEOUT),
+            http2=self._http2,
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        # lifespan 밖(스크립트 등)에서 사용된 경우에도 동작하도록 지연 생성
+        if self._client is None:
+            self._http2 = _http2_enabled()
+            self._client = self._build_client()
+        return self._client
+
+    async def start(self):
+        self._get_client()
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def send(self, payload: dict, timeout: float | None = None) -> dict:
+        client = self._get_client()
+        timeout = httpx.Timeout(timeout or _timeout_seconds(_operation(payload)), connect=settings.JANUS_CONNECT_TIMEOUT)
+        self._in_flight += 1
+        self._requests_total += 1
+        try:
+            response = await client.post(self.url, json=payload, timeout=timeout)
+            response.raise_for_status()
+            return _raise_for_janus_error(response.json())
+        except httpx.HTTPStatusError as e:
+            self._errors_total += 1
+            raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Failed to communicate with Janus server: {e.response.text}")
+        except (httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout):
+            self._errors_total += 1
+            raise JanusTimeout()
+        except httpx.RequestError as e:
+            self._errors_total += 1
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not connect to Janus server: {e}")
+        finally:
+            self._in_flight -= 1
+
+    def stats(self) -> dict:
+        """커넥션 풀 사용 현황"""
+        stats = {
+            "transport": self.name,
+            "open": self._client is not None,
+            "http2": self._http2,
+            "max_connections": settings.JANUS_HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": settings.JANUS_HTTP_MAX_KEEPALIVE,
+            "in_flight": self._in_flight,
+            "requests_total": self._requests_total,
+            "errors_total": self._errors_total,
+            "connections": 0,
+            "idle_connections": 0,
+        }
+        # httpcore 풀 내부 상태 (버전에 따라 없을 수 있음)
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+        return stats
+
+
+class JanusWebSocketTransport:
+    """하나의 Janus WebSocket 연결을 여러 요청이 공유 (transaction id로 응답을 매칭)"""
+
+    name = "websocket"
+
+    def __init__(self, url: str):
+        self.url = url
+        self.on_disconnect: Callable[[], None] | None = None
+        # transaction으로 매칭되지 않는 비동기 이벤트 수신 콜백
+        self.on_event: Callable[[dict], None] | None = None
+        self._ws = None
+        self._reader_task: asyncio.Task | None = None
+        self._connect_lock = asyncio.Lock()
+        self._pending: dict[str, asyncio.Future] = {}
+        self._awaiting_event: set[str] = set()
+        self._requests_total = 0
+        self._errors_total = 0
+        self._reconnects = 0
+        self._unmatched = 0
+
+    async def _connect(self):
+        from websockets.asyncio.client import connect
+
+        async with self._connect_lock:
+            if self._ws is not None:
+                return self._ws
+            try:
+                self._ws = await connect(
+                    self.url,
+                    subprotocols=["janus-protocol"],
+                    open_timeout=settings.JANUS_CONNECT_TIMEOUT,
+                    max_size=None,
+                )
+            except (OSError, asyncio.TimeoutError) as e:
+                raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Could not connect to Janus server: {e}")
+            self._reconnects += 1
+            self._reader_task = asyncio.create_task(self._reader(self._ws))
+            print(f"✅ Janus WebSocket connected: {self.url}")
+            return self._ws
+
+    async def _reader(self, ws):
+        """수신 메시지를 transaction id로 대기 중인 요청에 전달"""
+        try:
+            async for raw in ws:
+                message = json.loads(raw)
+                future = self._pending.get(message.get("transaction"))
+                if future is None or future.done():
+                    if self.on_event and message.get("janus") == "event":
+                        self.on_event(message)
+                    else:
+                        self._unmatched += 1
+                    continue
+                # 비동기 plugin 요청은 ack 이후 같은 transaction으로 event가 옴
+                if message.get("janus") == "ack" and message.get("transaction") in self._awaiting_event:
+                    continue
+                future.set_result(message)
+        except Exception as e:
+            print(f"❌ Janus WebSocket reader stopped: {e}")
+        finally:
+            self._drop_connection(ws)
+
+    def _drop_connection(self, ws):
+        if self._ws is not ws:
+            return
+        self._ws = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(JanusConnectionLost())
+                # 아직 future를 기다리기 전(전송 중)인 요청도 있으므로 미회수 경고가 나지 않도록 표시
+                future.exception()
+        self._pending.clear()
+        # Janus 세션은 WebSocket 연결에 묶여 있으므로 서비스 쪽 세션도 무효화
+        if self.on_disconnect:
+            self.on_disconnect()
+
+    async def start(self):
+        try:
+            await self._connect()
+        except HTTPException as e:
+            # 첫 요청 시 다시 연결을 시도하므로 기동은 막지 않음
+            print(f"⚠️ Janus WebSocket 연결 실패, 요청 시 재시도합니다: {e.detail}")
+
+    async def close(self):
+        ws, self._ws = self._ws, None
+        if self._reader_task:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if ws is not None:
+            await ws.close()
+        for future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    async def send(self, payload: dict, timeout: float | None = None) -> dict:
+        ws = self._ws or await self._connect()
+        transaction = payload["transaction"]
+        future = asyncio.get_running_loop().create_future()
+        self._pending[transaction] = future
+        if payload.get("janus") == "message":
+            self._awaiting_event.add(transaction)
+        self._requests_total += 1
+        try:
+            await ws.send(json.dumps(payload))
+            response = await asyncio.wait_for(future, timeout=timeout or _timeout_seconds(_operation(payload)))
+            return _raise_for_janus_error(response)
+        except asyncio.TimeoutError:
+            self._errors_total += 1
+            raise JanusTimeout()
+        except HTTPException:
+            self._errors_total += 1
+            raise
+        except Exception as e:
+            self._errors_total += 1
+            self._drop_connection(ws)
+            raise JanusConnectionLost(f"Could not connect to Janus server: {e}")
+        finally:
+            self._pending.pop(transaction, None)
+            self._awaiting_event.discard(transaction)
+
+    def stats(self) -> dict:
+        return {
+            "transport": self.name,
+            "open": self._ws is not None,
+            "in_flight": len(self._pending),
+            "requests_total": self._requests_total,
+            "errors_total": self._errors_total,
+            "connects_total": self._reconnects,
+            "unmatched_messages": self._unmatched,
+        }
+
+
+def build_transport(http_url: str, ws_url: str | None = None):
+    """설정(JANUS_TRANSPORT)에 따라 transport 생성"""
+    if settings.JANUS_TRANSPORT == "websocket":
+        if not ws_url:
+            raise ValueError("JANUS_TRANSPORT=websocket 사용 시 JANUS_WS_URL 설정이 필요합니다.")
+        return JanusWebSocketTransport(ws_url)
+    return JanusHttpTransport(http_url)
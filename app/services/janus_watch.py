@@ -0,0 +1,135 @@
+# app/services/janus_watch.py
+
+import asyncio
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class RoomSubscriber:
+    """스트림 클라이언트 하나의 이벤트 큐 (크기 제한)"""
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.lagged = 0
+
+    def push(self, event: dict, snapshot: dict) -> None:
+        """큐가 가득 찬 느린 클라이언트는 밀린 delta를 버리고 최신 스냅샷 하나로 대체"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged += 1
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(snapshot)
+
+
+class RoomWatcher:
+    """방 하나의 참여자 변화를 감시하는 upstream 작업 (구독자 전원이 공유)
+
+    상태 사본(mirror)이 켜져 있으면 변경 알림(notify) 즉시, 아니면 JANUS_WATCH_INTERVAL 마다
+    get_room_participants 결과를 이전 값과 비교해 join/leave/display delta를 만든다.
+    """
+
+    def __init__(self, service, room_id: int):
+        self.service = service
+        self.room_id = room_id
+        self.subscribers: set[RoomSubscriber] = set()
+        self.participants: dict[int, str] | None = None
+        self.task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    def snapshot(self) -> dict:
+        return {
+            "type": "snapshot",
+            "room": self.room_id,
+            "participants": [{"id": pid, "display": display} for pid, display in (self.participants or {}).items()],
+        }
+
+    def notify(self):
+        self._wake.set()
+
+    async def run(self):
+        while True:
+            try:
+                current = await self.service.get_room_participants(room_id=self.room_id)
+                self._publish_changes({p["id"]: p.get("display", "") for p in current})
+            except Exception as e:
+                print(f"❌ Room watcher poll failed for room {self.room_id}: {e}")
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=settings.JANUS_WATCH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    def _publish_changes(self, current: dict[int, str]):
+        previous, self.participants = self.participants, current
+        if previous is None:
+            self._broadcast(self.snapshot())
+            return
+        for pid, display in current.items():
+            if pid not in previous:
+                self._broadcast({"type": "join", "room": self.room_id, "id": pid, "display": display})
+            elif previous[pid] != display:
+                self._broadcast({"type": "display", "room": self.room_id, "id": pid, "display": display})
+        for pid in previous.keys() - current.keys():
+            self._broadcast({"type": "leave", "room": self.room_id, "id": pid})
+
+    def _broadcast(self, event: dict):
+        snapshot = self.snapshot()
+        for subscriber in self.subscribers:
+            subscriber.push(event, snapshot)
+
+
+class RoomWatchHub:
+    """방별 watcher를 관리 (첫 구독자가 오면 시작, 마지막 구독자가 나가면 종료)"""
+
+    def __init__(self, service):
+        self.service = service
+        self._watchers: dict[int, RoomWatcher] = {}
+        self.subscriptions_total = 0
+
+    def subscribe(self, room_id: int) -> RoomSubscriber:
+        watcher = self._watchers.get(room_id)
+        if watcher is None:
+            watcher = self._watchers[room_id] = RoomWatcher(self.service, room_id)
+            watcher.task = asyncio.create_task(watcher.run())
+        subscriber = RoomSubscriber(settings.JANUS_WATCH_QUEUE_SIZE)
+        if watcher.participants is not None:
+            subscriber.queue.put_nowait(watcher.snapshot())
+        watcher.subscribers.add(subscriber)
+        self.subscriptions_total += 1
+        return subscriber
+
+    def unsubscribe(self, room_id: int, subscriber: RoomSubscriber):
+        watcher = self._watchers.get(room_id)
+        if watcher is None:
+            return
+        watcher.subscribers.discard(subscriber)
+        if not watcher.subscribers:
+            watcher.task.cancel()
+            del self._watchers[room_id]
+
+    def notify(self, room_id: int | None):
+        """상태 사본이 바뀐 방의 watcher를 즉시 깨움 (None이면 전체)"""
+        if room_id is None:
+            for watcher in self._watchers.values():
+                watcher.notify()
+            return
+        watcher = self._watchers.get(room_id)
+        if watcher is not None:
+            watcher.notify()
+
+    def close(self):
+        for watcher in self._watchers.values():
+            watcher.task.cancel()
+        self._watchers.clear()
+
+    def stats(self) -> dict:
+        return {
+            "rooms": len(self._watchers),
+            "subscribers": sum(len(w.subscribers) for w in self._watchers.values()),
+            "subscriptions_total": self.subscriptions_total,
+            "lagged": sum(s.lagged for w in self._watchers.values() for s in w.subscribers),
+        }
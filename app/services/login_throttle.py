@@ -0,0 +1,142 @@
+# app/services/login_throttle.py
+
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, status
+from app.core.config import get_settings
+
+settings = get_settings()
+
+_PRUNE_INTERVAL = 60.0  # 다 채워진(=없는 것과 같은) 버킷을 정리하는 주기(초)
+
+
+class TokenBucketLimiter:
+    """키(IP/계정)별 token bucket (메모리 사용량은 max_keys로 제한, 오래된 키부터 제거)"""
+
+    def __init__(self, per_minute: int, burst: int, max_keys: int):
+        self.rate = per_minute / 60.0
+        self.burst = max(1, burst)
+        self.max_keys = max(1, max_keys)
+        # key -> [남은 토큰, 마지막 갱신 시각]
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._last_prune = time.monotonic()
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def take(self, key: str) -> float:
+        """토큰 하나 사용, 허용이면 0 아니면 다시 시도할 수 있을 때까지 남은 초"""
+        now = time.monotonic()
+        if now - self._last_prune >= _PRUNE_INTERVAL:
+            self._prune(now)
+        bucket = self._buckets.get(key)
+        tokens = self.burst if bucket is None else min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        if tokens < 1:
+            self._buckets[key] = [tokens, now]
+            return (1 - tokens) / self.rate
+        self._buckets[key] = [tokens - 1, now]
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+            self.evictions += 1
+        return 0.0
+
+    def _prune(self, now: float):
+        self._last_prune = now
+        for key in [k for k, (tokens, updated) in self._buckets.items() if tokens + (now - updated) * self.rate >= self.burst]:
+            del self._buckets[key]
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class RedisWindowLimiter:
+    """여러 워커가 한도를 공유하는 Redis 고정 윈도(60초) 카운터 (burst 만큼 추가 허용)"""
+
+    def __init__(self, client, prefix: str, per_minute: int, burst: int):
+        self.client = client
+        self.prefix = prefix
+        self.limit = per_minute + max(0, burst)
+        self.enabled = per_minute > 0
+        self.evictions = 0
+
+    async def take(self, key: str) -> float:
+        name = f"{self.prefix}:{key}"
+        async with self.client.pipeline(transaction=True) as pipe:
+            count, _, ttl = await pipe.incr(name).expire(name, 60, nx=True).ttl(name).execute()
+        return 0.0 if count <= self.limit else float(max(1, ttl))
+
+    def __len__(self) -> int:
+        return 0
+
+
+class LoginThrottle:
+    """로그인 시도를 bcrypt 검증 전에 IP별 / 계정(user_id)별로 제한"""
+
+    def __init__(self):
+        if settings.LOGIN_THROTTLE_BACKEND not in ("memory", "redis"):
+            raise ValueError("LOGIN_THROTTLE_BACKEND는 memory 또는 redis 이어야 합니다.")
+        self.backend = settings.LOGIN_THROTTLE_BACKEND
+        if self.backend == "redis":
+            try:
+                import redis.asyncio as redis
+            except ImportError:
+                raise RuntimeError("LOGIN_THROTTLE_BACKEND=redis 사용 시 redis 패키지가 필요합니다. (pip install redis)")
+            client = redis.from_url(settings.LOGIN_THROTTLE_REDIS_URL or "redis://127.0.0.1:6379/0")
+            self.by_ip = RedisWindowLimiter(client, "login_throttle:ip", settings.LOGIN_THROTTLE_IP_PER_MINUTE, settings.LOGIN_THROTTLE_IP_BURST)
+            self.by_account = RedisWindowLimiter(client, "login_throttle:account", settings.LOGIN_THROTTLE_ACCOUNT_PER_MINUTE, settings.LOGIN_THROTTLE_ACCOUNT_BURST)
+        else:
+            self.by_ip = TokenBucketLimiter(settings.LOGIN_THROTTLE_IP_PER_MINUTE, settings.LOGIN_THROTTLE_IP_BURST, settings.LOGIN_THROTTLE_MAX_KEYS)
+            self.by_account = TokenBucketLimiter(settings.LOGIN_THROTTLE_ACCOUNT_PER_MINUTE, settings.LOGIN_THROTTLE_ACCOUNT_BURST, settings.LOGIN_THROTTLE_MAX_KEYS)
+        self.allowed = 0
+        self.throttled_ip = 0
+        self.throttled_account = 0
+        self.backend_errors = 0
+
+    async def _take(self, limiter, key: str) -> float:
+        if not limiter.enabled:
+            return 0.0
+        if self.backend == "memory":
+            return limiter.take(key)
+        try:
+            return await limiter.take(key)
+        except Exception as e:
+            # 공유 저장소 장애 시 로그인 자체를 막지 않음 (bcrypt 작업자 풀 대기열이 마지막 방어선)
+            self.backend_errors += 1
+            print(f"⚠️ Login throttle backend error: {e}")
+            return 0.0
+
+    async def check(self, ip: str | None, user_id: str):
+        """한도를 넘으면 429 + Retry-After"""
+        retry_after = await self._take(self.by_ip, ip or "unknown")
+        if retry_after:
+            self.throttled_ip += 1
+        else:
+            retry_after = await self._take(self.by_account, user_id)
+            if retry_after:
+                self.throttled_account += 1
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please retry later",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.999)))},
+            )
+        self.allowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "allowed": self.allowed,
+            "throttled_ip": self.throttled_ip,
+            "throttled_account": self.throttled_account,
+            "tracked_ips": len(self.by_ip),
+            "tracked_accounts": len(self.by_account),
+            "evictions": self.by_ip.evictions + self.by_account.evictions,
+            "backend_errors": self.backend_errors,
+        }
+
+
+login_throttle = LoginThrottle()
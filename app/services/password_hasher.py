@@ -0,0 +1,173 @@
+# app/services/password_hasher.py
+
+import sys
+import time
+import asyncio
+import argparse
+import statistics
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+from app.core.config import get_settings
+from app.core.security import bcrypt_rounds, hash_password, set_bcrypt_rounds, verify_password
+
+settings = get_settings()
+
+_LATENCY_WINDOW = 256  # 보관하는 최근 처리 시간 개수
+_MIN_ROUNDS = 10       # 지연 목표가 아무리 작아도 이 아래로는 내리지 않음
+_MAX_ROUNDS = 16
+_CALIBRATION_SAMPLES = 3
+
+
+def _timed_call(fn, *args):
+    """작업자에서 실행: (bcrypt 실행 시간, 결과) 반환 (프로세스 풀에서도 쓰도록 모듈 함수로 둠)"""
+    started = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - started, result
+
+
+def _percentile_ms(samples: deque, q: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+
+
+def calibrate_bcrypt_rounds(target_ms: float) -> dict:
+    """이 서버에서 검증 한 번이 target_ms 안에 끝나는 가장 큰 bcrypt cost를 측정 (최소 _MIN_ROUNDS)
+
+    cost가 1 오를 때마다 시간이 두 배가 되므로 낮은 cost부터 올려가며 측정하고 목표를 넘으면 멈춘다.
+    """
+    from passlib.hash import bcrypt
+
+    measured: dict[int, float] = {}
+    chosen = _MIN_ROUNDS
+    for rounds in range(_MIN_ROUNDS, _MAX_ROUNDS + 1):
+        hashed = bcrypt.using(rounds=rounds).hash("calibration")
+        samples = []
+        for _ in range(_CALIBRATION_SAMPLES):
+            started = time.perf_counter()
+            bcrypt.verify("calibration", hashed)
+            samples.append(time.perf_counter() - started)
+        measured[rounds] = round(statistics.median(samples) * 1000, 2)
+        if measured[rounds] > target_ms:
+            break
+        chosen = rounds
+    return {"rounds": chosen, "target_ms": target_ms, "measured_ms": measured}
+
+
+class PasswordHasher:
+    """bcrypt 해시/검증을 이벤트 루프 밖(스레드 또는 프로세스 풀)에서 실행
+
+    풀의 작업자가 모두 바쁘면 최대 PASSWORD_HASH_MAX_QUEUE 개까지 대기시키고,
+    그 이상은 바로 503(Retry-After)으로 거절해 로그인 폭주가 다른 요청을 막지 않도록 한다.
+    """
+
+    def __init__(self):
+        if settings.PASSWORD_HASH_EXECUTOR not in ("thread", "process"):
+            raise ValueError("PASSWORD_HASH_EXECUTOR는 thread 또는 process 이어야 합니다.")
+        self.kind = settings.PASSWORD_HASH_EXECUTOR
+        self.workers = max(1, settings.PASSWORD_HASH_WORKERS)
+        self.max_queue = max(0, settings.PASSWORD_HASH_MAX_QUEUE)
+        self._executor: Executor | None = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.errors = 0
+        self._hash_seconds: deque = deque(maxlen=_LATENCY_WINDOW)
+        self._wait_seconds: deque = deque(maxlen=_LATENCY_WINDOW)
+        self.calibration: dict | None = None
+        self.rehashed = 0
+
+    async def calibrate(self):
+        """PASSWORD_HASH_TARGET_MS가 있고 BCRYPT_ROUNDS를 직접 지정하지 않았으면 시작 시 cost 결정"""
+        if not settings.PASSWORD_HASH_TARGET_MS or settings.BCRYPT_ROUNDS:
+            return
+        self.calibration = await asyncio.to_thread(calibrate_bcrypt_rounds, settings.PASSWORD_HASH_TARGET_MS)
+        # 작업자 풀은 처음 쓸 때 만들어지므로 프로세스 풀 작업자도 이 값을 물려받음
+        set_bcrypt_rounds(self.calibration["rounds"])
+        print(f"✅ bcrypt rounds calibrated: {self.calibration['rounds']} (target {settings.PASSWORD_HASH_TARGET_MS}ms, measured {self.calibration['measured_ms']})")
+
+    async def warm_up(self):
+        """작업자 풀을 미리 띄우고 bcrypt를 한 번 실행 (첫 로그인이 풀 생성 시간을 기다리지 않도록)"""
+        await self.hash("warm-up")
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    async def _run(self, fn, *args):
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many password requests, please retry later",
+                headers={"Retry-After": "1"},
+            )
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        submitted = time.perf_counter()
+        # 요청이 취소되어도 실제 작업이 끝날 때까지 in_flight에 포함 (대기열 크기를 정확히 유지)
+        job = self._get_executor().submit(_timed_call, fn, *args)
+        job.add_done_callback(lambda _: loop.is_closed() or loop.call_soon_threadsafe(self._release))
+        try:
+            hash_seconds, result = await asyncio.wrap_future(job)
+        except Exception:
+            self.errors += 1
+            raise
+        self.completed += 1
+        self._hash_seconds.append(hash_seconds)
+        self._wait_seconds.append(max(0.0, time.perf_counter() - submitted - hash_seconds))
+        return result
+
+    def _release(self):
+        self.in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(verify_password, password, hashed)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "bcrypt_rounds": bcrypt_rounds(),
+            "calibration": self.calibration,
+            "rehashed": self.rehashed,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "hash_ms": {q: _percentile_ms(self._hash_seconds, v) for q, v in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))},
+            "wait_ms": {q: _percentile_ms(self._wait_seconds, v) for q, v in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99))},
+        }
+
+
+password_hasher = PasswordHasher()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="이 서버에 맞는 bcrypt cost 측정 (결과를 BCRYPT_ROUNDS로 설정)")
+    parser.add_argument("--target-ms", type=float, default=settings.PASSWORD_HASH_TARGET_MS or 250.0, help="비밀번호 검증 한 번의 목표 지연(ms)")
+    result = calibrate_bcrypt_rounds(parser.parse_args(sys.argv[1:]).target_ms)
+    for rounds, ms in result["measured_ms"].items():
+        print(f"  rounds={rounds:<3}{ms:>10} ms")
+    print(f"BCRYPT_ROUNDS={result['rounds']}")
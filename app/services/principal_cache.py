@@ -0,0 +1,94 @@
+# app/services/principal_cache.py
+
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+
+from app.core.config import get_settings
+from app.core.database import replica_router
+from app.models.user import User
+from app.schemas.user import Principal
+
+settings = get_settings()
+
+
+class PrincipalCache:
+    """인증된 사용자 정보(Principal) 캐시 (LRU + TTL, user id 기준)
+
+    항목 만료 시각은 min(저장 시각 + TTL, 처음 조회한 access token의 exp) 이다.
+    같은 프로세스에서 ORM으로 User가 수정/삭제되면 자동으로 무효화되고,
+    다른 프로세스/직접 SQL로 바뀐 경우는 TTL이 지나야 반영된다.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[int, tuple[Principal, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def get(self, user_id: int) -> Principal | None:
+        if not self.enabled:
+            return None
+        entry = self._entries.get(user_id)
+        if entry is None or time.time() >= entry[1]:
+            if entry is not None:
+                del self._entries[user_id]
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(user_id)
+        return entry[0]
+
+    def put(self, principal: Principal, token_exp: float | None = None):
+        if not self.enabled:
+            return
+        expires_at = time.time() + self.ttl
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+        self._entries[principal.id] = (principal, expires_at)
+        self._entries.move_to_end(principal.id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *user_ids: int):
+        """사용자 정보가 바뀌었거나 비활성화된 경우 호출"""
+        for user_id in user_ids:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "max_entries": self.max_entries,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+principal_cache = PrincipalCache(settings.AUTH_PRINCIPAL_CACHE_TTL, settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User):
+    principal_cache.invalidate(target.id)
+    # replica에 반영되기 전까지는 primary에서 다시 읽도록 표시
+    replica_router.note_write(target.id)
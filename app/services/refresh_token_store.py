@@ -0,0 +1,444 @@
+# app/services/refresh_token_store.py
+
+import os
+import json
+import time
+import asyncio
+from datetime import datetime, timedelta
+from itertools import groupby
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.security import utcnow_naive
+from app.models.refresh_token import RefreshToken
+
+settings = get_settings()
+
+_PRUNE_INTERVAL = 60.0  # 만료/보관 기간이 지난 항목을 메모리에서 정리하는 주기(초)
+_DATETIME_FIELDS = ("created_at", "expires_at", "at")
+
+
+class SqlRefreshTokenStore:
+    """refresh_tokens 테이블을 직접 읽고 쓰는 저장소 (기본)
+
+    회전은 조건부 UPDATE + 새 토큰 insert를 요청의 DB 세션 한 트랜잭션에서 처리한다.
+    """
+
+    backend = "mysql"
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        pass
+
+    async def find_by_hash(self, db: AsyncSession, hashed: str) -> tuple[int, str] | None:
+        res = await db.execute(select(RefreshToken.user_id, RefreshToken.jti).where(RefreshToken.hashed_token == hashed))
+        row = res.first()
+        return (row.user_id, row.jti) if row else None
+
+    async def issue(self, db: AsyncSession, row: dict):
+        await db.execute(insert(RefreshToken).values(**row))
+        await db.commit()
+
+    async def rotate(self, db: AsyncSession, user_id: int, jti: str, hashed: str, now: datetime, new_row: dict) -> bool:
+        # 조건부 UPDATE 한 번으로 폐기 (동시에 같은 토큰으로 회전하면 한 요청만 성공)
+        res = await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.jti == jti,
+                RefreshToken.user_id == user_id,
+                RefreshToken.hashed_token == hashed,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > now,
+            )
+            .values(revoked_at=now)
+        )
+        if res.rowcount != 1:
+            await db.rollback()
+            return False
+        # 같은 트랜잭션에서 새 refresh token 저장
+        await db.execute(insert(RefreshToken).values(**new_row))
+        await db.commit()
+        return True
+
+    async def revoked_at(self, db: AsyncSession, user_id: int, jti: str, hashed: str) -> datetime | None:
+        res = await db.execute(
+            select(RefreshToken.revoked_at).where(
+                RefreshToken.jti == jti, RefreshToken.user_id == user_id, RefreshToken.hashed_token == hashed
+            )
+        )
+        return res.scalar_one_or_none()
+
+    async def revoke(self, db: AsyncSession, user_id: int, jti: str, hashed: str) -> bool:
+        res = await db.execute(
+            update(RefreshToken)
+            .where(
+                RefreshToken.jti == jti,
+                RefreshToken.user_id == user_id,
+                RefreshToken.hashed_token == hashed,
+                RefreshToken.revoked_at.is_(None),
+            )
+            .values(revoked_at=utcnow_naive())
+        )
+        await db.commit()
+        return bool(res.rowcount)
+
+    async def revoke_user(self, db: AsyncSession, user_id: int) -> list[str]:
+        """사용자의 살아 있는 refresh token을 모두 폐기하고 폐기한 jti 목록 반환"""
+        res = await db.execute(
+            select(RefreshToken.jti).where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+        )
+        jtis = res.scalars().all()
+        await db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=utcnow_naive())
+        )
+        await db.commit()
+        return list(jtis)
+
+    def stats(self) -> dict:
+        return {"backend": self.backend}
+
+
+class _Entry:
+    __slots__ = ("user_id", "hashed", "expires_at", "revoked_at")
+
+    def __init__(self, user_id: int, hashed: str, expires_at: datetime, revoked_at: datetime | None = None):
+        self.user_id = user_id
+        self.hashed = hashed
+        self.expires_at = expires_at
+        self.revoked_at = revoked_at
+
+
+class MemoryRefreshTokenStore:
+    """프로세스 메모리에서 jti/hash로 바로 조회하고, 변경은 로컬 journal에 먼저 기록한 뒤 MySQL에 배치로 반영 (write-behind)
+
+    - 변경(발급/폐기)은 journal 파일에 append + fsync 후 응답 (프로세스가 죽어도 재시작 시 journal을 다시 반영)
+    - REFRESH_STORE_FLUSH_INTERVAL 마다 쌓인 변경을 REFRESH_STORE_FLUSH_BATCH_SIZE 단위 트랜잭션으로 MySQL에 반영
+      (모두 다시 실행해도 결과가 같은 연산이라 실패하면 통째로 다시 시도)
+    - 시작 시 남은 journal을 MySQL에 반영한 뒤 살아 있는 토큰과 보관 기간 내 폐기 토큰을 MySQL에서 다시 적재
+    상태가 프로세스마다 따로 있으므로 워커 하나로 실행할 때만 사용한다.
+    """
+
+    backend = "memory"
+
+    def __init__(self, journal_dir: str | None = None):
+        self.journal_dir = journal_dir or settings.REFRESH_STORE_JOURNAL_DIR
+        self._entries: dict[str, _Entry] = {}
+        self._by_hash: dict[str, str] = {}
+        self._by_user: dict[int, set[str]] = {}
+        self._pending: list[dict] = []
+        self._journal = None
+        self._lock_file = None
+        self._segment = 0
+        self._closed_segments: list[str] = []
+        self._written = 0
+        self._synced = 0
+        self._sync_task: asyncio.Task | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._last_prune = time.monotonic()
+        self.flushed = 0
+        self.flush_batches = 0
+        self.flush_errors = 0
+        self.last_flush_ms: float | None = None
+        self.rebuild: dict | None = None
+
+    # --- 메모리 색인 ---
+
+    def _add(self, jti: str, entry: _Entry):
+        self._entries[jti] = entry
+        self._by_hash[entry.hashed] = jti
+        self._by_user.setdefault(entry.user_id, set()).add(jti)
+
+    def _remove(self, jti: str):
+        entry = self._entries.pop(jti)
+        self._by_hash.pop(entry.hashed, None)
+        jtis = self._by_user.get(entry.user_id)
+        if jtis is not None:
+            jtis.discard(jti)
+            if not jtis:
+                del self._by_user[entry.user_id]
+
+    def _match(self, user_id: int, jti: str, hashed: str) -> _Entry | None:
+        entry = self._entries.get(jti)
+        return entry if entry and entry.user_id == user_id and entry.hashed == hashed else None
+
+    def _prune(self):
+        now = utcnow_naive()
+        revoked_cutoff = now - timedelta(days=settings.REFRESH_PURGE_REVOKED_RETENTION_DAYS)
+        for jti in [
+            jti for jti, e in self._entries.items()
+            if e.expires_at <= now or (e.revoked_at is not None and e.revoked_at < revoked_cutoff)
+        ]:
+            self._remove(jti)
+
+    # --- journal ---
+
+    def _lock_journal_dir(self):
+        """journal 디렉터리를 이 프로세스만 쓰도록 잠금 (다른 워커/재시작 중인 이전 프로세스가 잡고 있으면 시작 중단)
+
+        segment 이름이 디렉터리만으로 정해지고 시작 시 남은 segment를 반영 후 삭제하므로,
+        두 프로세스가 같은 디렉터리를 쓰면 서로의 journal을 지워 refresh token이 사라진다.
+        """
+        import fcntl
+
+        lock_file = open(os.path.join(self.journal_dir, "refresh_tokens.lock"), "a")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise RuntimeError(
+                f"REFRESH_TOKEN_STORE=memory: journal 디렉터리({self.journal_dir})를 다른 프로세스가 사용 중입니다. "
+                "memory 저장소는 워커 1개로만 실행할 수 있습니다 (--workers 1, 이전 프로세스 종료 후 시작)."
+            )
+        self._lock_file = lock_file
+
+    def _unlock_journal_dir(self):
+        if self._lock_file is not None:
+            self._lock_file.close()  # 닫으면 flock도 풀림
+            self._lock_file = None
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.journal_dir, f"refresh_tokens.{segment:012d}.jsonl")
+
+    def _open_segment(self):
+        self._segment += 1
+        self._journal = open(self._segment_path(self._segment), "a", encoding="utf-8")
+
+    async def _append(self, *ops: dict):
+        for op in ops:
+            self._journal.write(json.dumps(op, default=datetime.isoformat) + "\n")
+        self._pending.extend(ops)
+        self._written += 1
+        if settings.REFRESH_STORE_JOURNAL_FSYNC:
+            await self._sync(self._written)
+        else:
+            self._journal.flush()
+
+    async def _sync(self, target: int):
+        # group commit: fsync 한 번이 그 전에 기록된 모든 요청을 함께 보장
+        while self._synced < target:
+            if self._sync_task is None:
+                self._sync_task = asyncio.create_task(self._fsync(self._journal, self._written))
+            await asyncio.shield(self._sync_task)
+
+    async def _fsync(self, journal, upto: int, close: bool = False):
+        try:
+            journal.flush()
+            await asyncio.to_thread(os.fsync, journal.fileno())
+            if close:
+                journal.close()
+            self._synced = max(self._synced, upto)
+        finally:
+            self._sync_task = None
+
+    # --- MySQL 반영 ---
+
+    @staticmethod
+    def _load_op(line: str) -> dict:
+        op = json.loads(line)
+        for field in _DATETIME_FIELDS:
+            if isinstance(op.get(field), str):
+                op[field] = datetime.fromisoformat(op[field])
+        return op
+
+    @staticmethod
+    async def _apply(ops: list[dict]):
+        """같은 종류끼리 묶어 순서대로 실행 (이미 반영된 연산을 다시 실행해도 결과가 같음)"""
+        async with engine.begin() as conn:
+            for kind, group in groupby(ops, key=lambda op: op["op"]):
+                group = list(group)
+                if kind == "insert":
+                    stmt = insert(RefreshToken).prefix_with("IGNORE", dialect="mysql").prefix_with("OR IGNORE", dialect="sqlite")
+                    await conn.execute(stmt, [{k: v for k, v in op.items() if k != "op"} for op in group])
+                elif kind == "revoke":
+                    stmt = (
+                        update(RefreshToken)
+                        .where(RefreshToken.jti == bindparam("b_jti"), RefreshToken.revoked_at.is_(None))
+                        .values(revoked_at=bindparam("b_at"))
+                    )
+                    await conn.execute(stmt, [{"b_jti": op["jti"], "b_at": op["at"]} for op in group])
+                else:
+                    for op in group:
+                        await conn.execute(
+                            update(RefreshToken)
+                            .where(
+                                RefreshToken.user_id == op["user_id"],
+                                RefreshToken.revoked_at.is_(None),
+                                RefreshToken.created_at <= op["at"],
+                            )
+                            .values(revoked_at=op["at"])
+                        )
+
+    async def flush(self):
+        while self._sync_task is not None:
+            await asyncio.shield(self._sync_task)
+        if not self._pending:
+            return
+        started = time.perf_counter()
+        # 여기서 가져간 변경은 모두 지금 segment에 있으므로, 새 segment로 바꾸고 이전 것을 fsync 후 닫음
+        batch, self._pending = self._pending, []
+        self._closed_segments.append(self._segment_path(self._segment))
+        closing = self._journal
+        self._open_segment()
+        self._sync_task = asyncio.create_task(self._fsync(closing, self._written, close=True))
+        await asyncio.shield(self._sync_task)
+        segments = list(self._closed_segments)
+        try:
+            size = max(1, settings.REFRESH_STORE_FLUSH_BATCH_SIZE)
+            for i in range(0, len(batch), size):
+                await self._apply(batch[i:i + size])
+                self.flush_batches += 1
+        except Exception:
+            self.flush_errors += 1
+            self._pending = batch + self._pending
+            raise
+        for path in segments:
+            os.remove(path)
+            self._closed_segments.remove(path)
+        self.flushed += len(batch)
+        self.last_flush_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(settings.REFRESH_STORE_FLUSH_INTERVAL)
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Refresh token store flush failed ({len(self._pending)} pending): {e}")
+            if time.monotonic() - self._last_prune >= _PRUNE_INTERVAL:
+                self._last_prune = time.monotonic()
+                self._prune()
+
+    async def _replay_journal(self) -> int:
+        """이전 실행에서 MySQL에 반영하지 못한 journal을 반영하고 삭제"""
+        paths = sorted(
+            os.path.join(self.journal_dir, name) for name in os.listdir(self.journal_dir)
+            if name.startswith("refresh_tokens.") and name.endswith(".jsonl")
+        )
+        ops = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        ops.append(self._load_op(line))
+                    except ValueError:
+                        # 기록 도중 종료되어 잘린 마지막 줄 (응답하지 않은 요청이므로 버림)
+                        break
+        size = max(1, settings.REFRESH_STORE_FLUSH_BATCH_SIZE)
+        for i in range(0, len(ops), size):
+            await self._apply(ops[i:i + size])
+        for path in paths:
+            os.remove(path)
+        return len(ops)
+
+    async def start(self):
+        started = time.monotonic()
+        os.makedirs(self.journal_dir, exist_ok=True)
+        self._lock_journal_dir()
+        replayed = await self._replay_journal()
+
+        now = utcnow_naive()
+        revoked_cutoff = now - timedelta(days=settings.REFRESH_PURGE_REVOKED_RETENTION_DAYS)
+        async with AsyncSessionLocal() as db:
+            rows = await db.execute(
+                select(
+                    RefreshToken.jti, RefreshToken.user_id, RefreshToken.hashed_token,
+                    RefreshToken.expires_at, RefreshToken.revoked_at,
+                ).where(
+                    RefreshToken.expires_at > now,
+                    (RefreshToken.revoked_at.is_(None)) | (RefreshToken.revoked_at >= revoked_cutoff),
+                )
+            )
+            for jti, user_id, hashed, expires_at, revoked_at in rows:
+                self._add(jti, _Entry(user_id, hashed, expires_at, revoked_at))
+
+        self._open_segment()
+        self.rebuild = {"replayed": replayed, "loaded": len(self._entries), "seconds": round(time.monotonic() - started, 3)}
+        print(f"✅ Refresh token store rebuilt: {self.rebuild}")
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        if self._journal is None:
+            self._unlock_journal_dir()
+            return
+        try:
+            await self.flush()
+        except Exception as e:
+            # journal은 남아 있으므로 다음 시작 시 반영됨
+            print(f"⚠️ Refresh token store final flush failed, {len(self._pending)} change(s) kept in journal: {e}")
+        self._journal.close()
+        self._journal = None
+        self._unlock_journal_dir()
+
+    # --- 저장소 연산 (db 인자는 SqlRefreshTokenStore와 같은 호출 형태를 위해 받기만 함) ---
+
+    async def find_by_hash(self, db: AsyncSession, hashed: str) -> tuple[int, str] | None:
+        jti = self._by_hash.get(hashed)
+        return (self._entries[jti].user_id, jti) if jti else None
+
+    async def issue(self, db: AsyncSession, row: dict):
+        self._add(row["jti"], _Entry(row["user_id"], row["hashed_token"], row["expires_at"]))
+        await self._append({"op": "insert", **row})
+
+    async def rotate(self, db: AsyncSession, user_id: int, jti: str, hashed: str, now: datetime, new_row: dict) -> bool:
+        # 확인과 폐기 사이에 await가 없으므로 같은 토큰으로 동시에 회전해도 한 요청만 성공
+        entry = self._match(user_id, jti, hashed)
+        if entry is None or entry.revoked_at is not None or entry.expires_at <= now:
+            return False
+        entry.revoked_at = now
+        self._add(new_row["jti"], _Entry(user_id, new_row["hashed_token"], new_row["expires_at"]))
+        # 새 토큰을 먼저 기록: 배치 경계에서 나뉘어 반영되더라도 세션에 살아 있는 토큰이 없는 순간이 생기지 않도록
+        await self._append({"op": "insert", **new_row}, {"op": "revoke", "jti": jti, "at": now})
+        return True
+
+    async def revoked_at(self, db: AsyncSession, user_id: int, jti: str, hashed: str) -> datetime | None:
+        entry = self._match(user_id, jti, hashed)
+        return entry.revoked_at if entry else None
+
+    async def revoke(self, db: AsyncSession, user_id: int, jti: str, hashed: str) -> bool:
+        entry = self._match(user_id, jti, hashed)
+        if entry is None or entry.revoked_at is not None:
+            return False
+        entry.revoked_at = utcnow_naive()
+        await self._append({"op": "revoke", "jti": jti, "at": entry.revoked_at})
+        return True
+
+    async def revoke_user(self, db: AsyncSession, user_id: int) -> list[str]:
+        now = utcnow_naive()
+        jtis = [jti for jti in self._by_user.get(user_id, ()) if self._entries[jti].revoked_at is None]
+        for jti in jtis:
+            self._entries[jti].revoked_at = now
+        await self._append({"op": "revoke_user", "user_id": user_id, "at": now})
+        return jtis
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend,
+            "entries": len(self._entries),
+            "pending": len(self._pending),
+            "flushed": self.flushed,
+            "flush_batches": self.flush_batches,
+            "flush_errors": self.flush_errors,
+            "last_flush_ms": self.last_flush_ms,
+            "rebuild": self.rebuild,
+        }
+
+
+def _create_store():
+    if settings.REFRESH_TOKEN_STORE == "memory":
+        return MemoryRefreshTokenStore()
+    if settings.REFRESH_TOKEN_STORE != "mysql":
+        raise ValueError("REFRESH_TOKEN_STORE는 mysql 또는 memory 이어야 합니다.")
+    return SqlRefreshTokenStore()
+
+
+refresh_token_store = _create_store()
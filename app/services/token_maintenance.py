@@ -0,0 +1,116 @@
+# app/services/token_maintenance.py
+"""만료/폐기된 refresh token 정리
+
+    python -m app.services.token_maintenance            # 한 번 실행 (cron 등)
+    python -m app.services.token_maintenance --batch-size 500 --batch-sleep 0.2
+
+서버 안에서 주기적으로 돌리려면 REFRESH_PURGE_ENABLED=true (워커가 여러 개면 한 곳에서만 켜거나 CLI 사용)
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from datetime import timedelta
+
+from sqlalchemy import delete, select
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.security import utcnow_naive
+from app.models.refresh_token import RefreshToken
+
+settings = get_settings()
+
+
+class RefreshTokenPurger:
+    """만료된 토큰과 보관 기간이 지난 폐기 토큰을 작은 배치로 삭제
+
+    expires_at / revoked_at 인덱스(InnoDB 보조 인덱스는 PK를 포함)로 오래된 순서대로 id를 골라
+    PK로 삭제하고 배치마다 commit + 잠시 쉬어, 테이블 잠금이 길어지지 않도록 한다.
+    """
+
+    def __init__(self, batch_size: int | None = None, batch_sleep: float | None = None):
+        self.batch_size = max(1, batch_size or settings.REFRESH_PURGE_BATCH_SIZE)
+        self.batch_sleep = settings.REFRESH_PURGE_BATCH_SLEEP if batch_sleep is None else batch_sleep
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.total_purged = 0
+        self.last_run: dict | None = None
+
+    async def _purge_where(self, column, cutoff) -> tuple[int, int]:
+        purged, batches = 0, 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                res = await db.execute(
+                    select(RefreshToken.id).where(column < cutoff).order_by(column).limit(self.batch_size)
+                )
+                ids = res.scalars().all()
+                if not ids:
+                    return purged, batches
+                await db.execute(delete(RefreshToken).where(RefreshToken.id.in_(ids)))
+                await db.commit()
+            purged += len(ids)
+            batches += 1
+            if len(ids) < self.batch_size:
+                return purged, batches
+            await asyncio.sleep(self.batch_sleep)
+
+    async def purge(self) -> dict:
+        started = time.monotonic()
+        now = utcnow_naive()
+        expired, expired_batches = await self._purge_where(RefreshToken.expires_at, now)
+        revoked_cutoff = now - timedelta(days=settings.REFRESH_PURGE_REVOKED_RETENTION_DAYS)
+        revoked, revoked_batches = await self._purge_where(RefreshToken.revoked_at, revoked_cutoff)
+        self.runs += 1
+        self.total_purged += expired + revoked
+        self.last_run = {
+            "expired": expired,
+            "revoked": revoked,
+            "batches": expired_batches + revoked_batches,
+            "seconds": round(time.monotonic() - started, 3),
+            "finished_at": time.time(),
+        }
+        print(f"🧹 Refresh token purge: {expired} expired, {revoked} revoked in {self.last_run['seconds']}s")
+        return self.last_run
+
+    async def _purge_loop(self):
+        while True:
+            try:
+                await self.purge()
+            except Exception as e:
+                print(f"❌ Refresh token purge failed: {e}")
+            await asyncio.sleep(settings.REFRESH_PURGE_INTERVAL)
+
+    def start(self):
+        self._task = asyncio.create_task(self._purge_loop())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "runs": self.runs,
+            "total_purged": self.total_purged,
+            "last_run": self.last_run,
+        }
+
+
+refresh_token_purger = RefreshTokenPurger()
+
+
+async def _main(args):
+    try:
+        await RefreshTokenPurger(args.batch_size, args.batch_sleep).purge()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="만료/폐기된 refresh token 정리")
+    parser.add_argument("--batch-size", type=int, default=None, help="배치당 삭제 행 수 (기본 REFRESH_PURGE_BATCH_SIZE)")
+    parser.add_argument("--batch-sleep", type=float, default=None, help="배치 사이 대기(초) (기본 REFRESH_PURGE_BATCH_SLEEP)")
+    asyncio.run(_main(parser.parse_args(sys.argv[1:])))
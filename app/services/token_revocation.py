@@ -0,0 +1,156 @@
+# app/services/token_revocation.py
+
+import time
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import event, func, or_, select
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal
+from app.core.security import session_id_of
+from app.models.user import User
+from app.models.refresh_token import RefreshToken
+
+settings = get_settings()
+
+_CURSOR_OVERLAP = timedelta(seconds=5)  # 늦게 commit된 행을 놓치지 않도록 이전 조회 구간과 겹쳐서 조회
+_LIVE_QUERY_CHUNK = 500                 # 살아 있는 세션 확인 쿼리 하나에 넣는 세션 id 수
+
+
+class RevocationList:
+    """stateless access token 모드에서 DB 조회 대신 확인하는 인메모리 폐기 목록
+
+    - 비활성화된 사용자: user id 집합 (해당 사용자의 모든 access token 거부)
+    - 끝난 로그인 세션: access token의 sid(refresh token jti 앞부분, 회전해도 유지) -> 보관 만료 시각
+      (로그아웃/재사용 감지로 세션의 refresh token이 모두 폐기되면 그 세션의 access token도 거부,
+      회전은 세션을 이어가므로 폐기로 보지 않음)
+    세션의 access token은 refresh token이 만들어질 때마다 발급되므로, 마지막 토큰의 exp
+    (마지막 refresh token created_at + ACCESS_EXPIRE_MINUTES)까지만 보관하고 정리한다.
+    발급 시각을 모르는 경우(요청 처리 중 직접 폐기)는 폐기 시각 + 수명으로 보관한다 (항상 exp 이후).
+    시작 시 DB에서 전체를 읽고 이후 AUTH_REVOCATION_REFRESH_INTERVAL 마다 바뀐 행만 읽어 반영한다.
+    """
+
+    def __init__(self):
+        self._inactive_users: set[int] = set()
+        self._sessions: dict[str, float] = {}
+        self._user_cursor: datetime | None = None
+        self._session_cursor: datetime | None = None
+        self._task: asyncio.Task | None = None
+        self.rejected = 0
+        self.refreshes = 0
+        self.last_refresh_at: float | None = None
+
+    @property
+    def _retention(self) -> float:
+        return settings.ACCESS_EXPIRE_MINUTES * 60
+
+    def is_revoked(self, payload: dict) -> bool:
+        sid = payload.get("sid")
+        revoked = int(payload["sub"]) in self._inactive_users or (sid is not None and session_id_of(sid) in self._sessions)
+        if revoked:
+            self.rejected += 1
+        return revoked
+
+    def revoke_session(self, sid: str, issued_at: datetime | None = None):
+        """issued_at: 세션의 마지막 refresh token(과 access token)이 발급된 시각 (없으면 지금으로 보고 넉넉히 보관)"""
+        if not settings.AUTH_STATELESS_TOKENS:
+            return
+        until = (issued_at.timestamp() if issued_at else time.time()) + self._retention
+        self._sessions[sid] = max(self._sessions.get(sid, 0.0), until)
+
+    def set_user_active(self, user_id: int, is_active: bool):
+        if is_active:
+            self._inactive_users.discard(user_id)
+        else:
+            self._inactive_users.add(user_id)
+
+    def _prune(self):
+        now = time.time()
+        for sid in [sid for sid, until in self._sessions.items() if until <= now]:
+            del self._sessions[sid]
+
+    async def refresh(self):
+        """마지막 조회 이후 바뀐 사용자 활성 상태와 폐기된 refresh token만 반영 (첫 호출은 전체 적재)"""
+        started = datetime.now()  # refresh_tokens.revoked_at은 앱이 기록하므로 앱 시계 기준
+        async with AsyncSessionLocal() as db:
+            query = select(User.id, User.is_active, User.updated_at)
+            if self._user_cursor is None:
+                query = query.where(User.is_active.is_(False))
+                # user.updated_at은 DB가 func.now()로 기록하므로 커서도 DB 시계로 시작 (앱/DB 시간대, 시계 차이 무관)
+                user_cursor = (await db.execute(select(func.now()))).scalar_one()
+            else:
+                query = query.where(User.updated_at >= self._user_cursor - _CURSOR_OVERLAP)
+                user_cursor = self._user_cursor
+            for user_id, is_active, updated_at in await db.execute(query):
+                self.set_user_active(user_id, is_active)
+                user_cursor = max(user_cursor, updated_at)
+
+            since = self._session_cursor - _CURSOR_OVERLAP if self._session_cursor else started - timedelta(seconds=self._retention)
+            session_cursor = self._session_cursor or since
+            tokens = await db.execute(
+                select(RefreshToken.jti, RefreshToken.created_at, RefreshToken.revoked_at).where(RefreshToken.revoked_at >= since)
+            )
+            ended: dict[str, datetime] = {}  # 세션 id -> 폐기된 토큰 중 가장 늦게 발급된 시각
+            for jti, created_at, revoked_at in tokens:
+                sid = session_id_of(jti)
+                ended[sid] = max(ended.get(sid, created_at), created_at)
+                session_cursor = max(session_cursor, revoked_at)
+            # 회전된 토큰은 같은 세션에 살아 있는 다음 토큰이 있으므로 제외 (로그아웃/재사용 감지만 남음)
+            for sid in await self._live_sessions(db, list(ended)):
+                del ended[sid]
+            for sid, issued_at in ended.items():
+                self.revoke_session(sid, issued_at)
+        self._user_cursor, self._session_cursor = user_cursor, session_cursor
+        self._prune()
+        self.refreshes += 1
+        self.last_refresh_at = time.time()
+
+    @staticmethod
+    async def _live_sessions(db, sids: list[str]) -> set[str]:
+        """아직 폐기되지 않은 refresh token이 있는 세션 id (jti unique index로 앞부분 범위 조회)"""
+        live = set()
+        for i in range(0, len(sids), _LIVE_QUERY_CHUNK):
+            chunk = sids[i:i + _LIVE_QUERY_CHUNK]
+            rows = await db.execute(
+                select(RefreshToken.jti).where(
+                    RefreshToken.revoked_at.is_(None), or_(*(RefreshToken.jti.startswith(sid) for sid in chunk))
+                )
+            )
+            live.update(session_id_of(jti) for jti in rows.scalars())
+        return live
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(settings.AUTH_REVOCATION_REFRESH_INTERVAL)
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"❌ Token revocation refresh failed: {e}")
+
+    async def start(self):
+        await self.refresh()
+        print(f"✅ Token revocation list loaded: {len(self._inactive_users)} inactive user(s), {len(self._sessions)} revoked session(s)")
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "inactive_users": len(self._inactive_users),
+            "revoked_sessions": len(self._sessions),
+            "rejected": self.rejected,
+            "refreshes": self.refreshes,
+            "last_refresh_at": self.last_refresh_at,
+        }
+
+
+token_revocations = RevocationList()
+
+
+@event.listens_for(User, "after_update")
+def _track_user_active(mapper, connection, target: User):
+    token_revocations.set_user_active(target.id, target.is_active)
@@ -0,0 +1,138 @@
+# app/services/user_import.py
+"""사용자 일괄 등록 (제휴사 데이터 등)
+
+    python -m app.services.user_import users.csv
+    python -m app.services.user_import users.jsonl --batch-size 2000 --workers 8
+
+CSV(헤더 포함) 또는 JSON Lines, 필드: user_id, user_name, user_pwd, user_number, user_gender
+비밀번호는 프로세스 풀에서 병렬로 bcrypt 해시하고, 배치 단위 multi-row INSERT로 저장한다.
+이미 있는 user_id(unique index)와 파일 안의 중복 user_id는 건너뛰고 개수만 집계한다.
+길이 초과 등 그 밖의 DB 오류는 무시하지 않고 그대로 실패시킨다.
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.core.database import engine
+from app.core.security import hash_password
+from app.models.user import User
+from app.schemas.user import UserCreate
+
+
+def read_rows(path: str) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def _batches(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _hash_batch(executor: ProcessPoolExecutor, rows: list[dict]) -> tuple[list[dict], int]:
+    """검증 + 병렬 해시 -> (insert할 값 목록, 잘못된 행 수)"""
+    valid, invalid = [], 0
+    for row in rows:
+        try:
+            valid.append(UserCreate(**row))
+        except (ValidationError, TypeError):
+            invalid += 1
+    loop = asyncio.get_running_loop()
+    hashes = await asyncio.gather(*(loop.run_in_executor(executor, hash_password, u.user_pwd) for u in valid))
+    values = [
+        {"user_id": u.user_id, "user_name": u.user_name, "user_pwd": h, "user_number": u.user_number, "user_gender": u.user_gender}
+        for u, h in zip(valid, hashes)
+    ]
+    return values, invalid
+
+
+async def _insert_batch(values: list[dict]) -> int:
+    """multi-row INSERT (중복 user_id는 건너뜀) -> 실제로 넣은 행 수
+
+    INSERT IGNORE는 중복 키뿐 아니라 길이 초과/잘못된 값 오류까지 경고로 바꿔 삼키므로 쓰지 않는다.
+    중복은 미리 조회해서 빼고, 그 사이 다른 경로로 들어온 user_id만 no-op ON DUPLICATE KEY UPDATE로 흡수한다.
+    (MySQL 드라이버는 CLIENT_FOUND_ROWS로 연결되어 no-op 갱신도 rowcount 1이므로 rowcount로는 중복을 셀 수 없음)
+    """
+    if not values:
+        return 0
+    async with engine.begin() as conn:
+        existing = set(
+            (await conn.execute(select(User.user_id).where(User.user_id.in_({v["user_id"] for v in values})))).scalars()
+        )
+        fresh = {}
+        for v in values:
+            if v["user_id"] not in existing:
+                fresh.setdefault(v["user_id"], v)
+        if not fresh:
+            return 0
+        if conn.dialect.name == "mysql":
+            stmt = mysql_insert(User).on_duplicate_key_update(user_id=User.user_id)
+        else:
+            stmt = sqlite_insert(User).on_conflict_do_nothing(index_elements=["user_id"])
+        # ORM bulk insert 대신 Core 연결로 실행
+        await conn.execute(stmt, list(fresh.values()))
+    return len(fresh)
+
+
+async def import_users(rows: Iterable[dict], batch_size: int = 1000, workers: int | None = None) -> dict:
+    started = time.monotonic()
+    totals = {"read": 0, "inserted": 0, "duplicates": 0, "invalid": 0}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+        pending_insert: asyncio.Task | None = None
+        pending_count = 0
+        for batch in _batches(rows, batch_size):
+            totals["read"] += len(batch)
+            # 이전 배치 INSERT와 다음 배치 해시를 겹쳐서 진행
+            values, invalid = await _hash_batch(executor, batch)
+            totals["invalid"] += invalid
+            if pending_insert is not None:
+                inserted = await pending_insert
+                totals["inserted"] += inserted
+                totals["duplicates"] += pending_count - inserted
+            pending_insert, pending_count = asyncio.create_task(_insert_batch(values)), len(values)
+            print(f"📥 {totals['read']} rows read, {totals['inserted']} inserted ({time.monotonic() - started:.1f}s)")
+        if pending_insert is not None:
+            inserted = await pending_insert
+            totals["inserted"] += inserted
+            totals["duplicates"] += pending_count - inserted
+    totals["seconds"] = round(time.monotonic() - started, 2)
+    return totals
+
+
+async def _main(args):
+    try:
+        result = await import_users(read_rows(args.path), args.batch_size, args.workers)
+        print(f"✅ User import finished: {result}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="사용자 일괄 등록")
+    parser.add_argument("path", help="CSV(헤더 포함) 또는 .jsonl 파일")
+    parser.add_argument("--batch-size", type=int, default=1000, help="INSERT 한 번에 넣을 행 수")
+    parser.add_argument("--workers", type=int, default=None, help="bcrypt 해시 프로세스 수 (기본 CPU 수)")
+    asyncio.run(_main(parser.parse_args(sys.argv[1:])))
@@ -0,0 +1,228 @@
+# bench/fake_janus.py
+"""벤치마크용 Janus 대역 서버 (HTTP + WebSocket, videoroom 플러그인 일부만 구현)
+
+    python -m bench.fake_janus --port 8188 --latency 0.002 --error-rate 0.01
+
+- core: create / attach / keepalive / detach / destroy
+- videoroom: create / list / listparticipants / exists / edit / destroy
+- 응답마다 latency(+ 0~jitter 랜덤) 만큼 지연, error_rate 확률로 전송 오류(HTTP 500 / WS 연결 끊김)
+"""
+
+import json
+import random
+import asyncio
+import argparse
+
+import uvicorn
+
+JANUS_ERROR_SESSION_NOT_FOUND = 458
+JANUS_ERROR_HANDLE_NOT_FOUND = 459
+VIDEOROOM_ERROR_NO_SUCH_ROOM = 426
+VIDEOROOM_ERROR_ROOM_EXISTS = 427
+
+
+class FakeJanus:
+    """Janus 상태(세션/핸들/방)를 메모리에 보관하고 요청 payload에 대한 응답을 만듦"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, participants: int = 3):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.participants = participants  # 방마다 채워 둘 가짜 참여자 수
+        self.sessions: dict[int, set[int]] = {}
+        self.rooms: dict[int, dict] = {}
+        self.requests = 0
+        self.injected_errors = 0
+        self._next_id = 1000
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def seed_rooms(self, count: int) -> list[int]:
+        """벤치마크 시작 전에 방을 미리 만들어 둠"""
+        return [self._create_room(None, f"bench room {i}") for i in range(count)]
+
+    def _create_room(self, room_id: int | None, description: str) -> int:
+        room_id = room_id or self._new_id()
+        self.rooms[room_id] = {
+            "description": description,
+            "participants": {self._new_id(): f"user{n}" for n in range(self.participants)},
+        }
+        return room_id
+
+    async def delay(self):
+        seconds = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def should_fail(self) -> bool:
+        if self.error_rate and random.random() < self.error_rate:
+            self.injected_errors += 1
+            return True
+        return False
+
+    def handle(self, payload: dict) -> dict:
+        self.requests += 1
+        kind = payload.get("janus")
+        transaction = payload.get("transaction")
+        session_id = payload.get("session_id")
+        handle_id = payload.get("handle_id")
+
+        def error(code: int, reason: str) -> dict:
+            return {"janus": "error", "transaction": transaction, "error": {"code": code, "reason": reason}}
+
+        if kind == "create":
+            session_id = self._new_id()
+            self.sessions[session_id] = set()
+            return {"janus": "success", "transaction": transaction, "data": {"id": session_id}}
+        if session_id not in self.sessions:
+            return error(JANUS_ERROR_SESSION_NOT_FOUND, f"No such session {session_id}")
+        if kind == "keepalive":
+            return {"janus": "ack", "session_id": session_id, "transaction": transaction}
+        if kind == "destroy":
+            del self.sessions[session_id]
+            return {"janus": "success", "session_id": session_id, "transaction": transaction}
+        if kind == "attach":
+            handle_id = self._new_id()
+            self.sessions[session_id].add(handle_id)
+            return {"janus": "success", "session_id": session_id, "transaction": transaction, "data": {"id": handle_id}}
+        if handle_id not in self.sessions[session_id]:
+            return error(JANUS_ERROR_HANDLE_NOT_FOUND, f"No such handle {handle_id} in session {session_id}")
+        if kind == "detach":
+            self.sessions[session_id].discard(handle_id)
+            return {"janus": "success", "session_id": session_id, "transaction": transaction}
+        if kind == "message":
+            return {
+                "janus": "success",
+                "session_id": session_id,
+                "sender": handle_id,
+                "transaction": transaction,
+                "plugindata": {"plugin": "janus.plugin.videoroom", "data": self._videoroom(payload.get("body") or {})},
+            }
+        return error(490, f"Unknown request '{kind}'")
+
+    def _videoroom(self, body: dict) -> dict:
+        request = body.get("request")
+        room_id = body.get("room")
+
+        def no_such_room() -> dict:
+            return {"videoroom": "event", "error_code": VIDEOROOM_ERROR_NO_SUCH_ROOM, "error": f"No such room ({room_id})"}
+
+        if request == "create":
+            if room_id in self.rooms:
+                return {"videoroom": "event", "error_code": VIDEOROOM_ERROR_ROOM_EXISTS, "error": f"Room {room_id} already exists"}
+            room_id = self._create_room(room_id, body.get("description", ""))
+            self.rooms[room_id]["participants"] = {}
+            return {"videoroom": "created", "room": room_id, "permanent": bool(body.get("permanent"))}
+        if request == "list":
+            return {"videoroom": "success", "list": [
+                {"room": rid, "description": room["description"], "num_participants": len(room["participants"])}
+                for rid, room in self.rooms.items()
+            ]}
+        if request == "exists":
+            return {"videoroom": "success", "room": room_id, "exists": room_id in self.rooms}
+        if room_id not in self.rooms:
+            return no_such_room()
+        if request == "listparticipants":
+            return {"videoroom": "participants", "room": room_id, "participants": [
+                {"id": pid, "display": display, "publisher": False} for pid, display in self.rooms[room_id]["participants"].items()
+            ]}
+        if request == "edit":
+            if body.get("new_description") is not None:
+                self.rooms[room_id]["description"] = body["new_description"]
+            return {"videoroom": "edited", "room": room_id, "permanent": bool(body.get("permanent"))}
+        if request == "destroy":
+            del self.rooms[room_id]
+            return {"videoroom": "destroyed", "room": room_id, "permanent": bool(body.get("permanent"))}
+        return {"videoroom": "event", "error_code": 422, "error": f"Unknown request '{request}'"}
+
+    # --- ASGI ---
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            await self._http(receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(receive, send)
+
+    async def _http(self, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        await self.delay()
+        if self.should_fail():
+            status_code, response = 500, {"error": "injected failure"}
+        else:
+            try:
+                status_code, response = 200, self.handle(json.loads(body or b"{}"))
+            except ValueError:
+                status_code, response = 400, {"error": "invalid json"}
+        data = json.dumps(response).encode()
+        await send({"type": "http.response.start", "status": status_code, "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": data})
+
+    async def _websocket(self, receive, send):
+        message = await receive()
+        if message["type"] != "websocket.connect":
+            return
+        await send({"type": "websocket.accept", "subprotocol": "janus-protocol"})
+        closed = asyncio.Event()  # 오류 주입으로 연결을 닫은 뒤에는 다른 응답을 보내지 않음
+        tasks = set()
+        try:
+            while True:
+                message = await receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                task = asyncio.create_task(self._ws_reply(json.loads(message.get("text") or message.get("bytes")), send, closed))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _ws_reply(self, payload: dict, send, closed: asyncio.Event):
+        # 실제 Janus처럼 요청마다 독립적으로 응답 (순서 보장 없음)
+        await self.delay()
+        if closed.is_set():
+            return
+        try:
+            if self.should_fail():
+                closed.set()
+                await send({"type": "websocket.close", "code": 1011})
+                return
+            await send({"type": "websocket.send", "text": json.dumps(self.handle(payload))})
+        except (OSError, RuntimeError):
+            # 클라이언트가 먼저 끊었거나 이미 닫힌 연결 (아무도 회수하지 않는 task 예외로 남기지 않음)
+            closed.set()
+
+
+async def serve(janus: FakeJanus, host: str = "127.0.0.1", port: int = 8188) -> uvicorn.Server:
+    """현재 이벤트 루프에서 대역 서버를 띄우고 요청을 받을 준비가 될 때까지 대기"""
+    server = uvicorn.Server(uvicorn.Config(janus, host=host, port=port, log_level="warning", lifespan="off"))
+    asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Janus 대역 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8188)
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="응답 지연에 더할 랜덤 값 상한(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="전송 오류 비율 (0~1)")
+    parser.add_argument("--rooms", type=int, default=0, help="미리 만들어 둘 방 개수")
+    parser.add_argument("--participants", type=int, default=3, help="미리 만든 방마다 넣을 참여자 수")
+    args = parser.parse_args()
+
+    janus = FakeJanus(args.latency, args.jitter, args.error_rate, args.participants)
+    janus.seed_rooms(args.rooms)
+    print(f"🧪 Fake Janus listening on http://{args.host}:{args.port}/janus (ws://{args.host}:{args.port}/)")
+    uvicorn.run(janus, host=args.host, port=args.port, log_level="warning", lifespan="off")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# bench/janus_bench.py
+"""/api/v1/janus/* 부하/지연 벤치마크
+
+    python -m bench.janus_bench --concurrency 32 --requests 2000 --latency 0.002
+    python -m bench.janus_bench --transport websocket --nodes 3 --json result.json
+
+기본은 Janus 대역 서버(bench.fake_janus)와 FastAPI 앱을 한 프로세스에서 띄우고 (DB 미사용)
+ASGI로 직접 요청한다. --url 을 주면 이미 실행 중인 서버(대역 Janus에 연결된)로 HTTP 요청한다.
+라우트별 처리량(req/s)과 p50/p95/p99 지연을 출력하고, --json 으로 결과를 저장해 실행 간 비교할 수 있다.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+
+import httpx
+
+from bench.fake_janus import FakeJanus, serve
+
+API = "/api/v1/janus"
+ROUTES = ["list", "participants", "create", "edit", "destroy"]
+
+# create 단계에서 만든 방 (edit/destroy 단계가 사용)
+created: list[int] = []
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class RouteResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies: list[float] = []
+        self.errors: dict[int | str, int] = {}
+        self.elapsed = 0.0
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies)
+        total = len(ordered) + sum(self.errors.values())
+        return {
+            "route": self.name,
+            "requests": total,
+            "errors": self.errors,
+            "rps": round(total / self.elapsed, 1) if self.elapsed else 0.0,
+            "p50_ms": round(_percentile(ordered, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(ordered, 0.95) * 1000, 2),
+            "p99_ms": round(_percentile(ordered, 0.99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        }
+
+
+async def _run_route(name: str, client: httpx.AsyncClient, make_request, requests: int, concurrency: int) -> RouteResult:
+    """고정 동시성으로 requests 개의 요청을 보냄 (worker가 남은 개수를 나눠 가짐)"""
+    result = RouteResult(name)
+    remaining = iter(range(requests))
+
+    async def worker():
+        for i in remaining:
+            method, url, body = make_request(i)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, url, json=body)
+                ok = response.status_code < 400
+                key = response.status_code
+            except httpx.HTTPError as e:
+                ok, key = False, type(e).__name__
+            if ok:
+                result.latencies.append(time.perf_counter() - started)
+                if name == "create":
+                    created.append(response.json()["room"])
+            else:
+                result.errors[key] = result.errors.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _request_factory(route: str, seeded: list[int]):
+    if route == "list":
+        return lambda i: ("GET", f"{API}/rooms", None)
+    if route == "participants":
+        return lambda i: ("GET", f"{API}/rooms/{random.choice(seeded)}/participants", None)
+    if route == "create":
+        return lambda i: ("POST", f"{API}/rooms", {"room_description": f"bench {i}"})
+    if route == "edit":
+        return lambda i: ("PATCH", f"{API}/rooms/{created[i % len(created)]}", {"new_description": f"edited {i}"})
+    if route == "destroy":
+        return lambda i: ("DELETE", f"{API}/rooms/{created[i]}", {})
+    raise ValueError(route)
+
+
+def _print_table(results: list[dict]):
+    print(f"{'route':<14}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for r in results:
+        errors = sum(r["errors"].values())
+        print(f"{r['route']:<14}{r['requests']:>10}{errors:>8}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['max_ms']:>10}")
+
+
+async def main(args) -> list[dict]:
+    janus_servers, fakes = [], []
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=30)
+        # 외부 서버 모드: 기존 방 목록을 조회 대상 방으로 사용
+        seeded = [room["room"] for room in (await client.get(f"{API}/rooms")).json()]
+        service = None
+    else:
+        for n in range(args.nodes):
+            fake = FakeJanus(args.latency, args.jitter, args.error_rate, args.participants)
+            fakes.append(fake)
+            janus_servers.append(await serve(fake, port=args.janus_port + n))
+        urls = [f"http://127.0.0.1:{args.janus_port + n}/janus" for n in range(args.nodes)]
+        ws_urls = [f"ws://127.0.0.1:{args.janus_port + n}/" for n in range(args.nodes)]
+        # 설정은 app import 시점에 읽히므로 그 전에 대역 서버 주소를 지정
+        os.environ["JANUS_SERVER_URL"] = urls[0]
+        os.environ["JANUS_SERVER_URLS"] = ",".join(urls)
+        os.environ["JANUS_WS_URL"] = ws_urls[0]
+        os.environ["JANUS_WS_URLS"] = ",".join(ws_urls)
+        os.environ["JANUS_TRANSPORT"] = args.transport
+        from app.main import app
+        from app.services.janus_service import janus_service as service
+
+        await service.start()
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30)
+        # 방 배치와 같은 규칙으로 노드별 대역 서버에 미리 방을 만듦
+        seeded = []
+        for i in range(args.rooms):
+            node, room_id = service.cluster.place_new_room()
+            fake = fakes[list(service.cluster.nodes).index(node.name)]
+            seeded.append(fake._create_room(room_id, f"bench room {i}"))
+
+    results = []
+    try:
+        for route in args.routes:
+            if route in ("participants",) and not seeded:
+                print(f"⚠️ skip {route}: 조회할 방이 없습니다 (--rooms)")
+                continue
+            if route in ("edit", "destroy") and not created:
+                print(f"⚠️ skip {route}: create 단계에서 만든 방이 없습니다")
+                continue
+            requests = min(args.requests, len(created)) if route == "destroy" else args.requests
+            result = await _run_route(route, client, _request_factory(route, seeded), requests, args.concurrency)
+            results.append(result.summary())
+    finally:
+        await client.aclose()
+        if service is not None:
+            await service.close()
+        for server in janus_servers:
+            server.should_exit = True
+
+    _print_table(results)
+    if fakes:
+        print(f"fake janus: requests={sum(f.requests for f in fakes)} injected_errors={sum(f.injected_errors for f in fakes)}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Janus 라우트 벤치마크")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시에 요청하는 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=2000, help="라우트별 요청 수")
+    parser.add_argument("--routes", nargs="+", default=ROUTES, choices=ROUTES)
+    parser.add_argument("--rooms", type=int, default=50, help="미리 만들어 둘 방 개수")
+    parser.add_argument("--participants", type=int, default=3, help="미리 만든 방마다 넣을 참여자 수")
+    parser.add_argument("--latency", type=float, default=0.001, help="대역 Janus 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="대역 Janus 응답 지연 랜덤 추가분 상한(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대역 Janus 전송 오류 비율 (0~1)")
+    parser.add_argument("--nodes", type=int, default=1, help="대역 Janus 노드 수")
+    parser.add_argument("--janus-port", type=int, default=18188, help="대역 Janus 첫 노드 포트")
+    parser.add_argument("--transport", choices=["http", "websocket"], default="http")
+    parser.add_argument("--url", help="이미 실행 중인 API 서버 주소 (지정 시 대역 서버를 띄우지 않음)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args(sys.argv[1:])))
@@ -0,0 +1,69 @@
+# bench/latency_shift.py
+"""Janus 지연이 갑자기 늘어났을 때 적응형 타임아웃이 다시 늘어나 요청이 복구되는지 확인
+
+    python -m bench.latency_shift --before 0.01 --after 1.0
+
+대역 Janus(bench.fake_janus)에 JanusNode 하나를 붙여 --before 지연으로 --warmup 개의 list 요청을 보내
+타임아웃을 학습시킨 뒤, 지연을 --after 로 바꾸고 --deadline 초 안에 list 요청이 다시 성공하는지 본다.
+복구되지 않으면 종료 코드 1.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+
+from fastapi import HTTPException
+
+from bench.fake_janus import FakeJanus, serve
+
+
+async def main(args) -> bool:
+    from app.services.janus_cluster import JanusNode
+
+    janus = FakeJanus(latency=args.before)
+    server = await serve(janus, port=args.janus_port)
+    node = JanusNode(f"http://127.0.0.1:{args.janus_port}/janus")
+    try:
+        await node.start()
+        await node.warm_up()
+        for _ in range(args.warmup):
+            await node.message({"request": "list"})
+        print(f"learned timeout: {node.latency.timeout_for('list') * 1000:.0f}ms (latency {args.before * 1000:.0f}ms)")
+
+        janus.latency = args.after
+        started = time.monotonic()
+        failures = 0
+        while time.monotonic() - started < args.deadline:
+            try:
+                await node.message({"request": "list"})
+            except HTTPException as e:
+                failures += 1
+                print(f"  {time.monotonic() - started:6.2f}s  {e.status_code} {e.detail}")
+                await asyncio.sleep(0.1)
+                continue
+            print(
+                f"✅ recovered after {time.monotonic() - started:.2f}s, {failures} failure(s), "
+                f"timeout now {node.latency.timeout_for('list') * 1000:.0f}ms (latency {args.after * 1000:.0f}ms)"
+            )
+            return True
+        print(f"❌ not recovered within {args.deadline}s ({failures} failures, breaker {node.breaker.stats()})")
+        return False
+    finally:
+        await node.close()
+        server.should_exit = True
+        await asyncio.sleep(0.2)
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Janus 지연 증가 시 적응형 타임아웃 복구 확인")
+    parser.add_argument("--before", type=float, default=0.01, help="학습 구간 대역 Janus 응답 지연(초)")
+    parser.add_argument("--after", type=float, default=1.0, help="바뀐 뒤 응답 지연(초, JANUS_READ_TIMEOUT보다 작아야 함)")
+    parser.add_argument("--warmup", type=int, default=300, help="학습용 list 요청 수 (지연 표본 창보다 크게)")
+    parser.add_argument("--deadline", type=float, default=30.0, help="복구를 기다리는 최대 시간(초)")
+    parser.add_argument("--janus-port", type=int, default=18198, help="대역 Janus 포트")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main(parse_args(sys.argv[1:]))) else 1)
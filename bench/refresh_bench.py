@@ -0,0 +1,185 @@
+# bench/refresh_bench.py
+"""refresh token 회전 처리량 벤치마크 (이전 방식 vs 현재 rotate_refresh)
+
+    python -m bench.refresh_bench --concurrency 32 --rotations 2000
+
+.env 의 DATABASE_URL(MySQL)에 벤치마크용 사용자/토큰을 만들고 끝나면 삭제한다.
+- legacy : 변경 전 구현 (hashed_token 조회 -> ORM 수정 -> insert -> commit)
+- jti    : 현재 구현 (jti 쿠키, REFRESH_TOKEN_STORE 저장소; mysql은 조건부 UPDATE + insert 한 트랜잭션)
+           REFRESH_TOKEN_STORE=memory 로 한 번 더 실행하면 메모리 저장소와 비교할 수 있다.
+각 방식마다 처리량(rotations/s), p50/p95/p99 지연과, 같은 토큰으로 동시에 회전했을 때 성공한 요청 수를 출력한다.
+"""
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import secrets
+from datetime import timedelta
+
+from sqlalchemy import delete, insert, select
+
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, engine
+from app.core.security import (
+    hash_refresh,
+    make_access_token,
+    make_refresh_cookie,
+    new_jti,
+    new_refresh_plain,
+    utcnow_naive,
+)
+from app.models.user import User
+from app.models.refresh_token import RefreshToken
+from app.services.auth_service import rotate_refresh
+from app.services.refresh_token_store import refresh_token_store
+
+_settings = get_settings()
+
+
+async def legacy_rotate(refresh_plain: str) -> str:
+    """변경 전 rotate_refresh (비교 기준)"""
+    async with AsyncSessionLocal() as db:
+        res = await db.execute(
+            select(RefreshToken).where(
+                RefreshToken.hashed_token == hash_refresh(refresh_plain),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > utcnow_naive(),
+            )
+        )
+        current = res.scalar_one_or_none()
+        if not current:
+            raise PermissionError("Invalid refresh token")
+        current.revoked_at = utcnow_naive()
+        new_plain = new_refresh_plain()
+        db.add(RefreshToken(
+            jti=new_jti(),
+            user_id=current.user_id,
+            hashed_token=hash_refresh(new_plain),
+            created_at=utcnow_naive(),
+            expires_at=utcnow_naive() + timedelta(days=_settings.REFRESH_EXPIRE_DAYS),
+        ))
+        await db.commit()
+        make_access_token(str(current.user_id))
+        return new_plain
+
+
+async def jti_rotate(refresh_cookie: str) -> str:
+    async with AsyncSessionLocal() as db:
+        _, _, new_cookie, _ = await rotate_refresh(db, refresh_cookie, None, None)
+        return new_cookie
+
+
+async def _issue(user_pk: int, legacy: bool) -> str:
+    plain, jti = new_refresh_plain(), new_jti()
+    row = {
+        "jti": jti,
+        "user_id": user_pk,
+        "hashed_token": hash_refresh(plain),
+        "created_at": utcnow_naive(),
+        "expires_at": utcnow_naive() + timedelta(days=1),
+    }
+    async with AsyncSessionLocal() as db:
+        if legacy:
+            await db.execute(insert(RefreshToken).values(**row))
+            await db.commit()
+        else:
+            await refresh_token_store.issue(db, {**row, "user_agent": None, "ip": None})
+    return plain if legacy else make_refresh_cookie(user_pk, jti, plain)
+
+
+def _percentile_ms(ordered: list[float], q: float) -> float:
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2) if ordered else 0.0
+
+
+async def run_mode(name: str, rotate, user_pk: int, args) -> dict:
+    legacy = name == "legacy"
+    latencies, errors = [], 0
+    remaining = iter(range(args.rotations))
+
+    async def worker():
+        nonlocal errors
+        token = await _issue(user_pk, legacy)
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                token = await rotate(token)
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+                token = await _issue(user_pk, legacy)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    # 같은 토큰으로 동시에 회전 -> 성공 수 (1이어야 정상)
+    race_successes = []
+    for _ in range(args.race_rounds):
+        token = await _issue(user_pk, legacy)
+        results = await asyncio.gather(*(rotate(token) for _ in range(args.race_width)), return_exceptions=True)
+        race_successes.append(sum(not isinstance(r, Exception) for r in results))
+
+    ordered = sorted(latencies)
+    return {
+        "mode": name,
+        "rotations": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": _percentile_ms(ordered, 0.50),
+        "p95_ms": _percentile_ms(ordered, 0.95),
+        "p99_ms": _percentile_ms(ordered, 0.99),
+        "race_max_successes": max(race_successes, default=0),
+    }
+
+
+async def main(args) -> list[dict]:
+    async with AsyncSessionLocal() as db:
+        user = User(
+            user_id=f"bench_refresh_{secrets.token_hex(4)}",
+            user_pwd="!",  # 로그인하지 않는 벤치마크 전용 계정
+            user_name="bench",
+            user_number="0",
+            user_gender=0,
+        )
+        db.add(user)
+        await db.commit()
+        user_pk = user.id
+
+    modes = {"legacy": legacy_rotate, "jti": jti_rotate}
+    results = []
+    await refresh_token_store.start()
+    try:
+        for name in args.modes:
+            results.append(await run_mode(name, modes[name], user_pk, args))
+    finally:
+        await refresh_token_store.close()
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(RefreshToken).where(RefreshToken.user_id == user_pk))
+            await db.execute(delete(User).where(User.id == user_pk))
+            await db.commit()
+        await engine.dispose()
+
+    print(f"{'mode':<8}{'rotations':>11}{'errors':>8}{'rot/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'race ok':>9}")
+    for r in results:
+        print(f"{r['mode']:<8}{r['rotations']:>11}{r['errors']:>8}{r['rps']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}{r['race_max_successes']:>9}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, ensure_ascii=False, indent=2)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="refresh token 회전 벤치마크")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시에 회전하는 세션 수")
+    parser.add_argument("--rotations", type=int, default=2000, help="방식별 회전 횟수")
+    parser.add_argument("--modes", nargs="+", default=["legacy", "jti"], choices=["legacy", "jti"])
+    parser.add_argument("--race-rounds", type=int, default=20, help="동시 회전 검사 반복 수")
+    parser.add_argument("--race-width", type=int, default=8, help="같은 토큰으로 동시에 보내는 회전 요청 수")
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일 경로")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args(sys.argv[1:])))
@@ -0,0 +1,34 @@
+"""user_id unique index 추가
+
+Revision ID: 3f9c2a7d41b8
+Revises: 8608f86ad80a
+Create Date: 2026-10-18 14:12:05.481233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d41b8'
+down_revision: Union[str, Sequence[str], None] = '8608f86ad80a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 이미 중복된 user_id가 있으면 index 생성이 실패하므로 먼저 알려줌
+    duplicates = op.get_bind().execute(
+        sa.text("SELECT user_id FROM user GROUP BY user_id HAVING COUNT(*) > 1 LIMIT 20")
+    ).scalars().all()
+    if duplicates:
+        raise RuntimeError(f"중복된 user_id를 먼저 정리해야 합니다: {duplicates}")
+    op.create_index(op.f('ix_user_user_id'), 'user', ['user_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_user_user_id'), table_name='user')
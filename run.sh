@@ -34,7 +34,16 @@ echo "의존성 설치 완료."
 # echo "DataBase Migration을 진행합니다."
 # sh ./migrate.sh
 
-# --- 3. 새 서버 실행 ---
+# --- 3. DB 스키마를 head로 맞춤 (서버는 시작 시 alembic_version을 확인만 하고 테이블을 만들지 않음) ---
+echo "DB 마이그레이션(alembic upgrade head)을 적용합니다..."
+$VENV_PYTHON -m alembic upgrade head
+
+if [ $? -ne 0 ]; then
+    echo "DB 마이그레이션에 실패했습니다. 스크립트를 중단합니다."
+    exit 1
+fi
+
+# --- 4. 새 서버 실행 ---
 echo "새로운 서버를 포트 $PORT 에서 시작합니다."
 # 가상 환경의 uvicorn을 직접 실행
 $VENV_UVICORN app.main:app --reload --port $PORT >> ./logs/app.log 2>&1 &